@@ -0,0 +1,212 @@
+# ----------------------------------------------------------------------
+# Name:        The counting game benchmark
+# Author:       Counting Game contributors
+# Purpose:     measure the frame loop and round generation
+#
+# Date:       Fall 2026
+# ----------------------------------------------------------------------
+"""
+Benchmark of the counting game
+
+Plays CountingGame the way a player would (a second on the welcome
+screen, game_logic, the images created and moved frame by frame, then
+get_user_answer) at rounds
+1, 10, 100 and 1000 of every difficulty, and reports the frames per
+second, the mean and tail time of a frame and the memory used.
+
+By default the game draws on the in-memory canvas of fakeTkinter.
+With --real-tk it uses the real tkinter, which needs a display, for
+example under Xvfb:
+
+    xvfb-run python benchmark.py --real-tk
+
+Results are saved as JSON so two versions can be compared:
+
+    python benchmark.py --output new.json --compare baseline.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import countingGame
+import fakeTkinter
+from gameHarness import HeadlessGame
+
+ROUNDS = (1, 10, 100, 1000)
+DIFFICULTIES = ('easy', 'medium', 'hard')
+
+
+def get_arguments():
+    """
+    Parse and validate the command line arguments.
+    :return: (argparse.Namespace) the benchmark settings
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--frames', type=int, default=1000,
+                        help='Frames to play in each round')
+    parser.add_argument('--fps', type=int, default=50,
+                        help='Frame rate the game is told to run at')
+    parser.add_argument('--real-tk', action='store_true',
+                        help='Draw with the real tkinter (needs a display)')
+    parser.add_argument('--output', default='benchmark.json',
+                        help='Where to save the results')
+    parser.add_argument('--compare', metavar='FILE',
+                        help='Earlier results to compare against')
+    return parser.parse_args()
+
+
+def percentile(values, fraction):
+    """
+    The value below which the given fraction of values fall
+    :param values: (list) sorted numbers
+    :param fraction: (float) from 0 to 1
+    :return: (float)
+    """
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def make_game(tk, difficulty, fps):
+    """
+    Create a game and take it from the welcome screen to the start
+    page, on a fake clock
+    :param tk: the tkinter module to draw with
+    :param difficulty: (String) the difficulty mode
+    :param fps: (int) the frame rate the game runs at
+    :return: (HeadlessGame) the game
+    """
+    harness = HeadlessGame([difficulty, f'--fps={fps}'], tk)
+    harness.start()
+    return harness
+
+
+def play_round(harness, round_number, frames):
+    """
+    Play one round of the game
+    :param harness: (HeadlessGame) the game to play
+    :param round_number: (int) which round to play
+    :param frames: (int) how many frames to play before answering
+    :return: tuple of the time of each frame in ms and the most images
+             on screen at once
+    """
+    game = harness.game
+    game.engine.round = round_number
+    durations = []
+    most_sprites = 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        game.game_logic()
+        for frame in range(frames):
+            start = time.perf_counter()
+            harness.frame()
+            durations.append((time.perf_counter() - start) * 1000)
+            most_sprites = max(most_sprites, len(game.sprites))
+        game.user_input.set(str(game.answer))
+        game.get_user_answer()
+    if harness.errors:
+        sys.exit(f'round {round_number}: a frame failed')
+    return durations, most_sprites
+
+
+def run_case(tk, difficulty, round_number, settings):
+    """
+    Measure one difficulty at one round number
+    :param tk: the tkinter module to draw with
+    :param difficulty: (String) the difficulty mode
+    :param round_number: (int) which round to play
+    :param settings: (argparse.Namespace) the benchmark settings
+    :return: (dict) the results
+    """
+    # First pass: time the frames
+    harness = make_game(tk, difficulty, settings.fps)
+    start = time.perf_counter()
+    durations, most_sprites = play_round(harness, round_number,
+                                         settings.frames)
+    elapsed = time.perf_counter() - start
+    harness.close()
+
+    # Second pass: measure memory, tracemalloc slows everything down
+    # so it is kept out of the timing
+    tracemalloc.start()
+    harness = make_game(tk, difficulty, settings.fps)
+    play_round(harness, round_number, settings.frames)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    harness.close()
+
+    durations.sort()
+    return {
+        'difficulty': difficulty,
+        'round': round_number,
+        'frames': len(durations),
+        'fps': len(durations) / elapsed,
+        'frame_ms_mean': sum(durations) / len(durations),
+        'frame_ms_p50': percentile(durations, 0.50),
+        'frame_ms_p95': percentile(durations, 0.95),
+        'frame_ms_p99': percentile(durations, 0.99),
+        'frame_ms_max': durations[-1],
+        'memory_peak_kib': peak / 1024,
+        'sprites_max': most_sprites,
+    }
+
+
+def compare(results, baseline):
+    """
+    Print how each result changed from the baseline
+    :param results: (list) the new results
+    :param baseline: (list) the earlier results
+    :return:
+    """
+    old = {(case['difficulty'], case['round']): case for case in baseline}
+    print('\nchange from baseline (negative frame time is faster)')
+    for case in results:
+        before = old.get((case['difficulty'], case['round']))
+        if before is None:
+            continue
+        changes = []
+        for key in ('frame_ms_mean', 'frame_ms_p99', 'memory_peak_kib'):
+            if before[key]:
+                change = (case[key] - before[key]) / before[key] * 100
+                changes.append(f'{key} {change:+.1f}%')
+        print(f"{case['difficulty']:>6} round {case['round']:>4}: "
+              + '  '.join(changes))
+
+
+def main():
+    settings = get_arguments()
+    tk = countingGame.tkinter if settings.real_tk else fakeTkinter
+
+    results = []
+    for difficulty in DIFFICULTIES:
+        for round_number in ROUNDS:
+            case = run_case(tk, difficulty, round_number, settings)
+            results.append(case)
+            print(f"{difficulty:>6} round {round_number:>4}: "
+                  f"{case['fps']:9.0f} fps  "
+                  f"mean {case['frame_ms_mean']:.3f} ms  "
+                  f"p99 {case['frame_ms_p99']:.3f} ms  "
+                  f"max {case['frame_ms_max']:.3f} ms  "
+                  f"peak {case['memory_peak_kib']:.0f} KiB")
+
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'backend': 'tkinter' if settings.real_tk else 'fakeTkinter',
+        'frames': settings.frames,
+        'fps': settings.fps,
+        'results': results,
+    }
+    with open(settings.output, 'w') as output:
+        json.dump(report, output, indent=2)
+
+    if settings.compare:
+        with open(settings.compare) as baseline:
+            compare(results, json.load(baseline)['results'])
+
+
+if __name__ == "__main__":
+    main()
@@ -22,6 +22,227 @@ Rules:
 import tkinter
 import argparse
 import random
+import time
+import array
+import operator
+import sys
+from gameEngine import GameEngine, STEP_MS, START_X, END_X
+from gameStats import FrameStats
+from gameReplay import ReplayRecorder, SEED_RANGE, ANSWER_RANGE
+from gameAssets import AssetManager
+from gameServer import RemoteEngine
+from gameScores import ScoreStore
+from gameTelemetry import TelemetryWriter
+from gameExport import FrameExporter
+from gameGovernor import LoadGovernor
+from gameSnapshot import SnapshotWriter
+from gameRender import CanvasBackend, BufferBackend, numpy
+
+# the game is simulated in fixed steps of STEP_MS milliseconds (from
+# gameEngine), the speed of the images is in pixels per step
+# below this many images moving them one by one is faster than NumPy
+VECTOR_MIN = 64
+# the most steps one frame may catch up on, any time beyond that is
+# dropped instead of freezing the window
+MAX_STEPS = 25
+# the live values in every row of the frame statistics, the counters of
+# both render backends are listed and the one not drawing stays at 0
+STAT_GAUGES = ('sprites', 'queue_depth', 'time_to_first_frame_ms',
+               'asset_decode_ms', 'pool_size', 'pool_in_use', 'pool_hits',
+               'pool_misses', 'pool_growth', 'buffer_sprites',
+               'buffer_pushes')
+
+
+class TickDriver:
+
+    """
+    Single frame scheduler that advances the whole game once per frame
+
+    Instead of every moving image owning its own after() chain, the
+    driver keeps one after() pending at a time and calls every
+    registered callback from it, so the Tcl event queue holds one
+    timer no matter how many images are on screen
+
+    Argument:
+    parent (tkinter.Tk): the root window object
+    fps (int): the target frame rate
+    clock (function): returns the current time in seconds
+
+    Attributes:
+        parent (tkinter.Tk): copy of the root window object
+        fps (int): the target frame rate
+        clock (function): returns the current time in seconds
+        interval (float): the target time of one frame in milliseconds
+        callbacks (list): the functions to call once per frame
+        after_id (str): the after ID of the pending frame, None when
+                        the driver is stopped
+    """
+
+    def __init__(self, parent, fps=50, clock=time.perf_counter):
+        self.parent = parent
+        self.fps = fps
+        self.clock = clock
+        self.interval = 1000 / fps
+        self.callbacks = []
+        self.after_id = None
+
+    def add(self, callback):
+        """
+        Register a function to be called once per frame
+        :param callback: (function) takes no argument
+        :return:
+        """
+        self.callbacks.append(callback)
+
+    def remove(self, callback):
+        """
+        Stop calling a function registered with add
+        :param callback: (function) the function to remove
+        :return:
+        """
+        if callback in self.callbacks:
+            self.callbacks.remove(callback)
+
+    def start(self):
+        """
+        Start the frame loop if it is not already running
+        :return:
+        """
+        if self.after_id is None:
+            self.after_id = self.parent.after(int(self.interval), self.tick)
+
+    def stop(self):
+        """
+        Cancel the pending frame
+        :return:
+        """
+        if self.after_id is not None:
+            self.parent.after_cancel(self.after_id)
+            self.after_id = None
+
+    def tick(self):
+        """
+        Run one frame: call every callback then schedule the next frame
+        The time spent in the callbacks is taken off the next wait so
+        the frame rate stays close to the target
+        A callback that raises is reported through the root window like
+        any other tkinter callback error and stays registered, the rest
+        of the frame still runs and the next frame is still scheduled
+        :return:
+        """
+        start = self.clock()
+        for callback in list(self.callbacks):
+            try:
+                callback()
+            except Exception:
+                self.parent.report_callback_exception(*sys.exc_info())
+        elapsed = (self.clock() - start) * 1000
+        delay = max(1, int(self.interval - elapsed))
+        self.after_id = self.parent.after(delay, self.tick)
+
+
+class SpriteTable:
+
+    """
+    Every moving image of the board, one row per image in the order
+    they appeared, kept in parallel arrays
+
+    The table is where the images are: the backend only draws what the
+    table says, so reading a position never asks the canvas. Each image
+    costs the same few bytes in every column. The round plan never puts
+    two images close together in a lane, so nothing is checked while
+    they move: every x moves at once, with NumPy when it is installed
+
+    Attributes:
+        ids (array): the handle of each image from the backend
+        lanes (array): the lane number of each image
+        xs (array): the x coordinate of each image
+        prev_xs (array): the x coordinate of each image before the last
+                         step, used to draw images between two steps
+        speeds (array): how many pixels each image moves per step
+    """
+
+    __slots__ = ('ids', 'lanes', 'xs', 'prev_xs', 'speeds')
+
+    def __init__(self):
+        self.ids = array.array('q')
+        self.lanes = array.array('b')
+        self.xs = array.array('d')
+        self.prev_xs = array.array('d')
+        self.speeds = array.array('d')
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __iter__(self):
+        return iter(self.ids)
+
+    def add(self, image_id, lane, x, speed):
+        """
+        Start tracking a new image
+        :param image_id: the handle of the new image
+        :param lane: (int) the lane number the image moves along
+        :param x: (float) the starting x coordinate
+        :param speed: (float) how many pixels it moves per step
+        :return:
+        """
+        self.ids.append(image_id)
+        self.lanes.append(lane)
+        self.xs.append(x)
+        self.prev_xs.append(x)
+        self.speeds.append(speed)
+
+    def cull(self, limit):
+        """
+        Forget every image past an x coordinate
+        :param limit: (float) the x coordinate
+        :return: (list) the handles of the images forgotten
+        """
+        if not self.xs or max(self.xs) <= limit:
+            return []
+        keep = [row for row, x in enumerate(self.xs) if x <= limit]
+        gone = [image_id for row, image_id in enumerate(self.ids)
+                if self.xs[row] > limit]
+        for name in ('ids', 'lanes', 'xs', 'prev_xs', 'speeds'):
+            column = getattr(self, name)
+            setattr(self, name, array.array(column.typecode,
+                                            [column[row] for row in keep]))
+        return gone
+
+    def clear(self):
+        """
+        Forget every image
+        :return:
+        """
+        for name in ('ids', 'lanes', 'xs', 'prev_xs', 'speeds'):
+            del getattr(self, name)[:]
+
+    def advance(self):
+        """
+        Move every image forward by its own speed, by one step
+        :return:
+        """
+        self.prev_xs[:] = self.xs
+        if numpy is not None and len(self.xs) >= VECTOR_MIN:
+            # A view of the array, changed in place without a copy
+            xs = numpy.frombuffer(self.xs, dtype=numpy.float64)
+            xs += numpy.frombuffer(self.speeds, dtype=numpy.float64)
+            del xs
+        else:
+            self.xs = array.array('d', map(operator.add, self.xs,
+                                           self.speeds))
+
+    def positions(self, alpha):
+        """
+        Where to draw every image, between its last two positions
+        :param alpha: (float) how far from the position before the
+                      last step to the last position, from 0 to 1
+        :return: (list) (handle, lane, x) of every image
+        """
+        return [(image_id, lane, prev_x + (x - prev_x) * alpha)
+                for image_id, lane, x, prev_x
+                in zip(self.ids, self.lanes, self.xs, self.prev_xs)]
+
 
 class CountingGame:
 
@@ -29,7 +250,13 @@ class CountingGame:
     GUI for counting game
 
     Argument:
-    parent (tkinter.Tk): the root window object
+    parent (tkinter.Tk): the root window object, or the frame of one
+                         board on a split screen
+    argv (list): the command line arguments, defaults to sys.argv
+    assets (AssetManager): where the images come from, defaults to the
+                           manager shared by every game in parent
+    driver (TickDriver): the frame loop shared by every board of a
+                         split screen, None to run one of its own
 
     Attributes:
         parent (tkinter.Tk): copy of the root window object
@@ -41,17 +268,59 @@ class CountingGame:
                 that hold buttons and info in the bottom of the screen
         canvas (tkinter.Canvas): the widget defining the area to
                                 animate moving images
-        canvas1 (tkinter.Canvas): the widget the bind with an event
+        backend (CanvasBackend or BufferBackend): draws the moving
+                                                  images on canvas,
+                                                  None until game_page
+        canvas1 (tkinter.Canvas): the widget the bind with an event,
+                                  created once by end_game and reused
+        play_again_button (tkinter.Button): on the end screen, let the
+                                            player start a new game
         count_canvas: (tkinter.Canvas): the widget hold the guess image
         image_on_canvas (image obj): the widget hold the guess image
+        assets (AssetManager): decodes the images on first use and
+                               shares them between games
         image_list (list): list of images objects that will be use
                             for animate
-        list_of_after (list): the after id of each images
+        started (float): the time the game was created
+        time_to_first_frame (float): ms from creating the game to the
+                                     welcome screen being drawn
+        plan (RoundPlan): when the images of the current round appear,
+                          None when no round is playing
+        round_time (float): the simulated ms since the current round
+                            started
+        plan_time (float): how far the round plan has run in ms, behind
+                           round_time when the governor slowed it
+        governor (LoadGovernor): slows the round down when frames get
+                                 too slow, None outside endless mode
+        last_frame (float): the clock time of the last frame
+        lag (float): the ms of wall clock time not yet simulated
+        sprites (SpriteTable): the lane, position and speed of every
+                               image still moving
+        driver (TickDriver): calls animation once per frame
+        recorder (ReplayRecorder): writes the session to a replay
+                                   file, None when not recording
+        scores (ScoreStore): keeps every final score, None when scores
+                             are not kept
+        telemetry (TelemetryWriter): streams the events of every round,
+                                     None when telemetry is off
+        exporter (FrameExporter): saves the frames as an animation,
+                                  None when not exporting
+        round_started (float): the driver clock when the round started
+        first_spawn (float): the round time in ms the first image of
+                             the round appeared, None before that
+        last_exit (float): the round time in ms the last image of the
+                           round left the canvas, None before that
+        stats (FrameStats): measures frames and hot paths, None when
+                            the game is not instrumented
+        overlay (int): the item id of the statistics text on canvas,
+                       None when the overlay is off
         reset_button (tkinter.Button): let the player reset the game
         next_round_button (tkinter.Button): let the player move to
                                             next round
         end_button (tkinter.Button): let the player give up mid-way
         submit_button (tkinter.Button): let player submit their answer
+        engine (GameEngine): the rules, lives, round and score of the
+                             game
         current_lives (int): hold the player's lives
         current_round (int): hold the current round that player is play
         current_score (int): hold the score that player has earn
@@ -71,68 +340,178 @@ class CountingGame:
 
 
 
-    def __init__(self, parent):
-        self.difficulty, self.name = self.get_arguments()
+    def __init__(self, parent, argv=None, assets=None, driver=None):
+        arguments = self.get_arguments(argv)
+        self.difficulty = arguments.difficulty
+        self.name = arguments.name
+        self.backend_name = arguments.backend
 
         # for later use
         self.user_answer = None
 
 
-        # - A list to store the after IDs of all the after method
-        #   waiting to be invoked
+        # - The plan of the images still to appear this round, consumed
+        #   by the frame loop
         # - new_round boolean variable to clarify if this is the
         #   beginning of a round(if yes, we can submit player's answer
         #   with submit button)
         # - next_round boolean variable to see if we can move onto next
         #  round and animates the moving icons for next round with
         #  next_round_button
-        self.list_of_after_id = []
+        self.plan = None
+        self.round_time = 0
+        self.plan_time = 0
+        self.lag = 0
+        self.sprites = SpriteTable()
+
+        # In endless mode the rounds grow until frames get too slow,
+        # then the governor spreads the images of a round out
+        self.governor = None
+        if arguments.endless:
+            budget = arguments.frame_budget
+            if budget is None:
+                budget = 500 / arguments.fps
+            self.governor = LoadGovernor(budget, STEP_MS)
         self.new_round = True
         self.next_round = True
 
         # Initialize the stage of the game
-        # Give amount of lives depending on difficulty and sets speed
-        # Easy - 3 lives, 1 pixel speed
-        # Medium - 2 lives, 2 pixel speed
-        # Hard - 1 live, 2 pixel speed
-        if self.difficulty == 'easy':
-            self.current_lives = 3
-            self.speed = 1
-        elif self.difficulty == 'medium':
-            self.current_lives = 2
-            self.speed = 2
+        # The engine gives amount of lives depending on difficulty and
+        # sets speed. It makes each next round in a worker thread while
+        # the current one is played. With a server the rules run there
+        # and this window only draws
+        if arguments.server is not None:
+            self.engine = RemoteEngine(arguments.server, self.difficulty,
+                                       arguments.seed)
         else:
-            self.current_lives = 1
-            self.speed = 2
-
-        self.current_round = 1
-        self.current_score = 0
-
-        # upload images first
-        spartan_icon_img = tkinter.PhotoImage(file='SpartanSpirit.gif')
-        butterfly_icon_img = tkinter.PhotoImage(file='butterfly.gif')
-        logo1_img = tkinter.PhotoImage(file='logo1.gif')
-        logo2_img = tkinter.PhotoImage(file='logo2.gif')
-
-        self.image_list = [spartan_icon_img, butterfly_icon_img,
-                           logo1_img, logo2_img]
+            self.engine = GameEngine(self.difficulty, arguments.seed,
+                                     prefetch=True,
+                                     endless=arguments.endless)
+        self.speed = self.engine.speed
+
+        # Images are decoded when first needed, or while the welcome
+        # screen is up, so the window appears right away
+        self.started = time.perf_counter()
+        self.time_to_first_frame = None
+        if assets is None:
+            assets = AssetManager.shared(parent, tkinter.PhotoImage)
+        self.assets = assets
 
         # Create the initial screen: Welcome screen
+        # A board of a split screen lives in a frame of the window, the
+        # window itself is set up by split_screen
         self.parent = parent
-        self.parent.title("Counting Game")
-        self.parent.geometry('500x580')
+        if driver is None:
+            self.parent.title("Counting Game")
+            self.parent.geometry('500x580')
 
         self.main_frame = tkinter.Frame(parent)
         self.main_frame.grid()
 
+        # The end screen is only created when the game first ends
+        self.canvas1 = None
+        # The moving images are drawn once game_page creates the canvas
+        self.backend = None
+
+        # Optional instrumentation: time the frames and the hot paths
+        # and count the calls made on the canvas
+        self.stats = None
+        self.show_overlay = arguments.overlay
+        self.overlay = None
+        self.overlay_summary = None
+        if arguments.stats or arguments.overlay:
+            self.stats = FrameStats(arguments.stats, gauges=STAT_GAUGES)
+            self.animation = self.stats.frame(self.animation,
+                                              self.sample_stats)
+            self.create_image = self.stats.timed('create_image',
+                                                 self.create_image)
+            self.game_logic = self.stats.timed('game_logic',
+                                               self.game_logic)
+
+        # One frame loop moves every image on the canvas, or on every
+        # board of a split screen
+        if driver is None:
+            driver = TickDriver(parent, arguments.fps)
+        self.driver = driver
+        self.last_frame = self.driver.clock()
+        self.driver.add(self.animation)
+        if self.show_overlay:
+            self.driver.add(self.update_overlay)
+        self.driver.start()
+
+        # Optional recording of the session to a replay file
+        self.recorder = None
+        if arguments.record:
+            self.recorder = ReplayRecorder(arguments.record, self.difficulty,
+                                           self.engine.seed, arguments.fps,
+                                           self.driver.clock)
+
+        # Optional store of every final score, shown on the end screen
+        self.scores = None
+        if arguments.scores:
+            self.scores = ScoreStore(arguments.scores)
+
+        # Optional stream of what happens in every round
+        self.telemetry = None
+        self.round_started = None
+        self.first_spawn = None
+        self.last_exit = None
+        if arguments.telemetry:
+            self.telemetry = TelemetryWriter(
+                arguments.telemetry, {'player': self.name,
+                                      'difficulty': self.difficulty,
+                                      'seed': self.engine.seed})
+
+        # Optional animation of the session, drawn off-screen
+        self.exporter = None
+        if arguments.export:
+            self.exporter = FrameExporter(arguments.export,
+                                          arguments.export_fps,
+                                          pixels=self.assets.pixels_of)
+
+        # Optional live state for spectators and monitors, written to
+        # a memory-mapped file every frame
+        self.snapshot = None
+        if arguments.snapshot:
+            self.snapshot = SnapshotWriter(arguments.snapshot, self.name,
+                                           self.difficulty)
+
         # call method to make the welcome screen
         self.make_welcome_screen()
 
-    def get_arguments(self):
+    @property
+    def image_list(self):
+        return self.assets.all()
+
+    @property
+    def current_lives(self):
+        return self.engine.lives
+
+    @property
+    def current_round(self):
+        return self.engine.round
+
+    @property
+    def current_score(self):
+        return self.engine.score
+
+    @property
+    def answer(self):
+        if self.engine.current is None:
+            return None
+        return self.engine.current.answer
+
+    @staticmethod
+    def get_arguments(argv=None):
         """
         Parse and validate the command line arguments.
-        :return: tuple containing the difficulty (string)
-                 and name (string)
+        :param argv: (list) the arguments to parse, defaults to sys.argv
+        :return: (argparse.Namespace) containing the difficulty (string),
+                 name (string), fps (int), stats (string),
+                 overlay (boolean), seed (int), record (string),
+                 backend (string), server (string), scores (string),
+                 telemetry (string), export (string), export_fps (int),
+                 endless (boolean), frame_budget (float) and players (int)
         """
         parser = argparse.ArgumentParser()
         parser.add_argument('difficulty',
@@ -145,10 +524,90 @@ class CountingGame:
                             nargs='?',
                             default='Player')
 
-        arguments = parser.parse_args()
-        name = arguments.name
-        difficulty = arguments.difficulty
-        return difficulty, name
+        parser.add_argument('--fps', type=int, default=50,
+                            help='Target frame rate of the animation')
+
+        parser.add_argument('--stats', metavar='FILE',
+                            help='Write frame statistics to FILE '
+                                 '(CSV if it ends in .csv, else JSONL)')
+
+        parser.add_argument('--overlay', action='store_true',
+                            help='Show frame statistics on the canvas')
+
+        parser.add_argument('--seed', type=int,
+                            help='Seed of every random choice of the game')
+
+        parser.add_argument('--record', metavar='FILE',
+                            help='Append a replay of the session to FILE')
+
+        parser.add_argument('--backend', choices=['canvas', 'buffer'],
+                            default='canvas',
+                            help='Draw each image as a canvas item, or '
+                                 'every image into one pixel buffer')
+
+        parser.add_argument('--server', metavar='HOST:PORT',
+                            help='Play on a gameServer instead of locally')
+
+        parser.add_argument('--scores', metavar='FILE',
+                            help='Keep every final score in FILE and show '
+                                 'the best ones at the end')
+
+        parser.add_argument('--telemetry', metavar='FILE',
+                            help='Stream the events of every round to '
+                                 'FILE as JSON lines')
+
+        parser.add_argument('--export', metavar='PATH',
+                            help='Save the frames as an animated PNG if '
+                                 'PATH ends in .png, else as PNG files '
+                                 'in the directory PATH')
+
+        parser.add_argument('--export-fps', type=int, default=25,
+                            help='Frames per second of the export')
+
+        parser.add_argument('--endless', action='store_true',
+                            help='Wrong answers cost no life, and images '
+                                 'are spread out when frames get too slow')
+
+        parser.add_argument('--frame-budget', type=float, metavar='MS',
+                            help='The ms a frame may take in endless mode, '
+                                 'half the frame interval by default')
+
+        parser.add_argument('--snapshot', metavar='FILE',
+                            help='Publish the state of the game to FILE '
+                                 'every frame, watch it with gameSnapshot')
+
+        parser.add_argument('--players', type=int, default=1,
+                            help='Players counting side by side, 1 to 4')
+
+        arguments = parser.parse_args(argv)
+        if arguments.fps <= 0:
+            parser.error('fps must be a positive number')
+        if arguments.export_fps <= 0:
+            parser.error('export-fps must be a positive number')
+        if arguments.frame_budget is not None and \
+                arguments.frame_budget <= 0:
+            parser.error('frame-budget must be a positive number')
+        if arguments.endless and (arguments.server or arguments.record):
+            # the images appear when the machine allows, a replay could
+            # not show them at the same times again
+            parser.error('--endless does not work with --server or '
+                         '--record')
+        if arguments.seed is not None and arguments.seed not in SEED_RANGE:
+            parser.error('seed must be from 0 to 2**64 - 1')
+        if arguments.backend == 'buffer' and numpy is None:
+            parser.error('the buffer backend needs NumPy installed')
+        if arguments.server is not None and \
+                not arguments.server.rpartition(':')[2].isdigit():
+            parser.error('server must be given as HOST:PORT')
+        if not 1 <= arguments.players <= 4:
+            parser.error('players must be from 1 to 4')
+        if arguments.players > 1 and (arguments.stats or arguments.record
+                                      or arguments.telemetry
+                                      or arguments.export
+                                      or arguments.snapshot):
+            parser.error('--stats, --record, --telemetry, --export and '
+                         '--snapshot are for one player')
+        return arguments
 
     def make_welcome_screen(self):
         """
@@ -189,6 +648,21 @@ class CountingGame:
                                     bg='steelblue')
         start_game.grid()
 
+        # Once the welcome screen is drawn, measure how long it took
+        # and decode the images in the background
+        self.parent.after_idle(self.first_frame_drawn)
+
+    def first_frame_drawn(self):
+        """
+        Record the time to the first frame and start decoding the
+        images while the player reads the rules
+        :return:
+        """
+        if self.time_to_first_frame is None:
+            self.time_to_first_frame = (time.perf_counter()
+                                        - self.started) * 1000
+        self.assets.preload()
+
 
     def start_game(self):
         """
@@ -245,6 +719,23 @@ class CountingGame:
                                      background='white')
         # register our canvas with a geometry manager
         self.canvas.grid()
+        if self.stats is not None:
+            self.canvas = self.stats.count_calls(self.canvas)
+        if self.show_overlay:
+            self.overlay = self.canvas.create_text(5, 5, anchor='nw',
+                                                   font='arial 8',
+                                                   fill='gray')
+        # the backend picked on the command line draws the images
+        if self.backend_name == 'buffer':
+            self.backend = BufferBackend(self.canvas, tkinter.PhotoImage,
+                                         pixels=self.assets.pixels_of)
+        else:
+            self.backend = CanvasBackend(self.canvas, self.speed)
+        # The images drawn off the canvas are read from tkinter now,
+        # not when the first copy appears in the middle of a round
+        if self.backend_name == 'buffer' or self.exporter is not None:
+            for obj in self.image_list:
+                self.assets.pixels_of(obj)
 
         # establish button
         self.bottom_frame = tkinter.Frame(self.main_frame)
@@ -296,13 +787,17 @@ class CountingGame:
         self.status.set('Enter your answer in text field above and '
                         'press submit!')
 
-        # Randomizes an index and retrieves an image from
-        # self.image_list as the image to count. If there is no image on
-        # count canvas, create an image and stores the image_ID. If
-        # there is already an image, simply replaces that image with
-        # the new image
-        index_of_obj = random.randint(0,3)
-        new_obj = self.image_list[index_of_obj]
+        # The engine randomizes an index of self.image_list as the
+        # image to count, the amount of images to be created for each
+        # of the 4 icon and when each of them appears. The round was
+        # made in the background while the last one was played.
+        # If there is no image on count canvas, create an image and
+        # stores the image_ID. If there is already an image, simply
+        # replaces that image with the new image
+        round_state = self.engine.new_round()
+        if self.recorder is not None:
+            self.recorder.round_start(round_state.number)
+        new_obj = self.image_list[round_state.target]
         if self.image_on_count_canvas is None:
             self.image_on_count_canvas = self.count_canvas.create_image(25, 25,
                                                                  image=new_obj)
@@ -310,59 +805,20 @@ class CountingGame:
             self.count_canvas.itemconfig(self.image_on_count_canvas,
                                          image=new_obj)
 
-        # Randomizes the amount of images to be created for each
-        # of the 4 icon
-        num_of_first_image = random.randint(1, self.current_round+1)
-        num_of_second_image = random.randint(1, self.current_round+1)
-        num_of_third_image = random.randint(1, self.current_round+1)
-        num_of_fourth_image = random.randint(1, self.current_round+1)
-
-        # Find and stores the correct answer to the question
-        self.answer = None
-        if index_of_obj == 0:
-            self.answer = num_of_first_image
-        elif index_of_obj == 1:
-            self.answer = num_of_second_image
-        elif index_of_obj == 2:
-            self.answer = num_of_third_image
-        else:
-            self.answer = num_of_fourth_image
-
-        # ~~for debug purpose~~
-        # print(num_of_first_image)
-        # print(num_of_second_image)
-        # print(num_of_third_image)
-        # print(num_of_fourth_image)
-
-        # Use a random wait timer for after method. These after methods
-        # creates an image on the canvas and animates them
-        # Add the after_id of each after method to list_of_after_id
-        # After each iteration, increases wait_timer by 1500 for the
-        # next image's after method
-        wait_timer = random.randint(500, 1000)
-        for x in range(num_of_first_image):
-            after_id = self.parent.after(wait_timer,
-                                lambda: self.create_image(self.image_list[0]))
-            self.list_of_after_id.append(after_id)
-            wait_timer += 1500
-        wait_timer = random.randint(300, 500)
-        for x in range(num_of_second_image):
-            after_id = self.parent.after(wait_timer,
-                                lambda: self.create_image(self.image_list[1]))
-            self.list_of_after_id.append(after_id)
-            wait_timer += 1500
-        wait_timer = random.randint(500, 1000)
-        for x in range(num_of_third_image):
-            after_id = self.parent.after(wait_timer,
-                                lambda: self.create_image(self.image_list[2]))
-            self.list_of_after_id.append(after_id)
-            wait_timer += 1500
-        wait_timer = random.randint(600, 1000)
-        for x in range(num_of_fourth_image):
-            after_id = self.parent.after(wait_timer,
-                                lambda: self.create_image(self.image_list[3]))
-            self.list_of_after_id.append(after_id)
-            wait_timer += 1500
+        # Keep the engine's plan of when each image appears, the
+        # frame loop creates the images as they become due
+        self.plan = round_state.plan
+        self.round_time = 0
+        self.plan_time = 0
+        if self.governor is not None:
+            self.governor.new_round()
+        self.round_started = self.driver.clock()
+        self.first_spawn = None
+        self.last_exit = None
+        if self.telemetry is not None:
+            self.telemetry.emit('round_start', round=round_state.number,
+                                ms=0, target=round_state.target,
+                                images=sum(round_state.counts))
 
         # Prints the correct answer to console
         # for error checking purposes
@@ -414,25 +870,24 @@ class CountingGame:
                                        command=self.get_user_answer)
         submit_button.grid(row=1, column=2)
 
-    def create_image(self, obj):
+    def create_image(self, index, lane):
         """
-        This method creates an image on the canvas based on the image
-        passed in as parameter but randomizes the y-axis placement
-        location on the canvas. This method also stores the image_id of
-        the newly created image and passes it to the animation method
-        :param obj:(image object) the image that will be drawn on canvas
+        This method shows an image on the canvas based on the index of
+        the image passed in as parameter in the lane the round plan
+        picked for it. This method also stores the image_id of the newly
+        created image in sprites so the animation method moves it on
+        the next frame
+        :param index: (int) the index of the image that will be drawn
+        :param lane: (int) the lane number, sets the y-axis placement
         :return:
         """
-        randomize = random.randint(0,3)
-        if randomize == 0:
-            image_id = self.canvas.create_image(25, 50, image=obj)
-        elif randomize == 1:
-            image_id = self.canvas.create_image(25, 125, image=obj)
-        elif randomize == 2:
-            image_id = self.canvas.create_image(25, 200, image=obj)
-        else:
-            image_id = self.canvas.create_image(25, 275, image=obj)
-        self.animation(image_id)
+        obj = self.image_list[index]
+        image_id = self.backend.add(obj, lane, START_X)
+        self.sprites.add(image_id, lane, START_X, self.speed)
+        if self.exporter is not None:
+            self.exporter.add(image_id, obj)
+        if self.snapshot is not None:
+            self.snapshot.add(image_id, index)
 
     def get_user_answer(self):
         """
@@ -441,11 +896,17 @@ class CountingGame:
         :return:
         """
         try:
-            self.user_answer = int(self.user_input.get())
-            self.user_input.set('')
+            answer = int(self.user_input.get())
         except ValueError:
             self.status.set('Invalid input! Please try again')
             return
+        # No count gets anywhere near this, and a replay could not
+        # store it
+        if answer not in ANSWER_RANGE:
+            self.status.set('Invalid input! Please try again')
+            return
+        self.user_answer = answer
+        self.user_input.set('')
 
         # If it is not the beginning of a new round set user_answer
         # do nothing else and return
@@ -461,127 +922,300 @@ class CountingGame:
 
         # If you presses the submit button early before animation
         # finishes, this section:
-        # - cancel all the after method in queue waiting to create
-        #   new images on canvas.
-        # - Clear the list_of_after_id to hold fresh new after_ids
-        #   of next round
-        # - Delete all items(images still moving) on canvas
+        # - drop the plan of the images still waiting to appear
+        # - Hide all items(images still moving) on canvas
         ###
-        for after_id in self.list_of_after_id:
-            self.parent.after_cancel(after_id)
-        self.list_of_after_id.clear()
-        self.canvas.delete("all")
-
-        # Increments and update the current round label
-        self.current_round += 1
+        self.plan = None
+        self.clear_sprites()
+
+        # The engine increments the round, and the score if answer is
+        # correct or decrements player's remaining lives if not
+        answered_round = self.current_round
+        correct = self.engine.submit(self.user_answer)
+        if self.telemetry is not None:
+            # Reaction time: from the last image leaving to the answer
+            elapsed = (self.driver.clock() - self.round_started) * 1000
+            reaction = None
+            if self.last_exit is not None:
+                reaction = elapsed - self.last_exit
+            self.telemetry.emit('answer', round=answered_round,
+                                ms=round(elapsed, 1),
+                                reaction_ms=reaction and round(reaction, 1),
+                                answer=self.user_answer, correct=correct,
+                                lives=self.current_lives,
+                                score=self.current_score)
+        if self.recorder is not None:
+            self.recorder.answer(self.user_answer, self.current_score,
+                                 self.current_lives)
+
+        # Update the current round label
         self.num_round.configure(text=f'Round  {self.current_round}')
 
-        # If answer is correct, increments and updates the score
-        if self.user_answer == self.answer:
-            self.current_score += 1
+        # If answer is correct, updates the score
+        if correct:
             self.score.configure(text=f'Score  {self.current_score}')
             self.status.set('Correct Answer! Press next round to continue')
         else:
-            # If answer is incorrect, decrements player's remaining
-            # lives
             # If lives hit 0, invokes end_game() function and return
             # Else, update the remaining lives of player
-            self.current_lives -= 1
-            if self.current_lives == 0:
+            if self.engine.game_over:
                 self.end_game()
                 return
             self.num_lives.configure(text=f'Lives remain {self.current_lives}')
             self.status.set('Incorrect Answer! Press next round to continue')
 
 
-    def animation(self, image_id):
+    def spawn_images(self):
+        """
+        Create every image of the round plan that is due by the time
+        the plan has run, as long as the governor does not hold them
+        :return:
+        """
+        if self.plan is None:
+            return
+        if self.governor is not None and \
+                self.governor.hold(len(self.sprites), self.round_time):
+            return
+        for index, lane in self.plan.due(self.plan_time):
+            if self.recorder is not None:
+                self.recorder.spawn(self.round_time, index, lane)
+            if self.first_spawn is None:
+                self.first_spawn = self.round_time
+                if self.telemetry is not None:
+                    self.telemetry.emit('first_spawn',
+                                        round=self.current_round,
+                                        ms=self.round_time, image=index,
+                                        lane=lane)
+            self.create_image(index, lane)
+            if self.governor is not None:
+                self.governor.spawned(self.round_time)
+                # the copies not taken stay in the plan for later
+                if self.governor.hold(len(self.sprites), self.round_time):
+                    break
+
+    def animation(self):
+        """
+        Create animation of the pictures, called once per frame by the
+        driver
+        The game is simulated in fixed steps of STEP_MS following the
+        wall clock, so a late frame runs several steps instead of
+        slowing the images down, then the images are drawn between
+        the last two steps
+        :return:
         """
-        Create animation of the picture
-        :param image_id: the image_id to animates
+        start = time.perf_counter()
+        now = self.driver.clock()
+        self.lag += (now - self.last_frame) * 1000
+        self.last_frame = now
+
+        steps = int(self.lag // STEP_MS)
+        if steps > MAX_STEPS:
+            # Too far behind to catch up, forget the extra time
+            steps = MAX_STEPS
+            self.lag = steps * STEP_MS
+        for step in range(steps):
+            self.step()
+        self.lag -= steps * STEP_MS
+
+        positions = self.render(self.lag / STEP_MS)
+
+        cost = (time.perf_counter() - start) * 1000
+        if self.governor is not None:
+            self.govern(cost)
+        if self.snapshot is not None:
+            self.snapshot.publish(now, self.current_round,
+                                  self.current_lives, self.current_score,
+                                  self.engine.game_over, cost, positions)
+
+    def govern(self, cost):
+        """
+        Hand the cost of the frame to the governor and report what it
+        changed
+        :param cost: (float) the ms the frame took
         :return:
         """
-        # Declare variables x, y
-        x = None
-        y = None
+        change = self.governor.measure(cost, len(self.sprites))
+        if change is not None and self.telemetry is not None:
+            self.telemetry.emit('governor', round=self.current_round,
+                                ms=self.round_time, **change)
 
-        # If the canvas is not empty(has images), then retrieves the
-        # x,y coordinates of the image
-        if self.canvas.find_all():
-            x, y = self.canvas.coords(image_id)
+    def step(self):
+        """
+        Advance the game by one fixed step of STEP_MS: move every
+        image still on the canvas and create the images that are due
+        :return:
+        """
+        self.round_time += STEP_MS
+        # The plan stops while the governor holds images back and until
+        # the images it held have appeared, so they only ever come
+        # later than planned, never closer together
+        if self.governor is None:
+            self.plan_time += STEP_MS
+        elif not self.governor.hold(len(self.sprites), self.round_time) \
+                and not self.images_waiting():
+            self.plan_time += STEP_MS * self.governor.rate
+
+        # If the x coordinates is > 520 then stop animating and
+        # stop drawing it
+        gone = self.sprites.cull(END_X)
+        for image_id in gone:
+            self.backend.remove(image_id)
+            if self.exporter is not None:
+                self.exporter.remove(image_id)
+            if self.snapshot is not None:
+                self.snapshot.remove(image_id)
+        if gone and not self.sprites and self.plan is not None and \
+                not self.plan.remaining:
+            self.last_exit = self.round_time
+            if self.telemetry is not None:
+                self.telemetry.emit('last_exit', round=self.current_round,
+                                    ms=self.round_time)
+
+        # Else, moves the image by the speed amount according
+        # to self.speed
+        # The round plan keeps the images of a lane apart, so they
+        # never overlap and all of them move at once
+        self.sprites.advance()
+
+        self.spawn_images()
+
+    def images_waiting(self):
+        """
+        Whether images of the plan were due and have not appeared yet
+        :return: (boolean)
+        """
+        if self.plan is None:
+            return False
+        wait = self.plan.next_wait
+        return wait is not None and wait <= self.plan_time
 
-        # If x and y are None or the x coordinates is > 520 then returns
-        # and stop animating
-        if x is None and y is None or x > 520:
+    def render(self, alpha):
+        """
+        Draw every image between its position before and after the
+        last step
+        :param alpha: (float) how far into the next step the wall
+                      clock is, from 0 to 1
+        :return: (list) (handle, lane, x) of every image drawn
+        """
+        positions = self.sprites.positions(alpha)
+        if self.backend is None:
+            # Still on the welcome screen, there is nothing to draw
+            return positions
+        self.backend.draw(positions)
+        if self.exporter is not None:
+            self.exporter.capture(self.driver.clock(), positions)
+        return positions
+
+    def sample_stats(self):
+        """
+        The live values recorded with every frame statistic
+        :return: (dict) images on screen, images waiting in the round
+                 plan and the counters of the render backend
+        """
+        gauges = {'sprites': len(self.sprites),
+                  'queue_depth': 0 if self.plan is None
+                  else self.plan.remaining,
+                  'time_to_first_frame_ms': self.time_to_first_frame,
+                  'asset_decode_ms': self.assets.decode_ms}
+        if self.backend is not None:
+            gauges.update(self.backend.stats())
+        return gauges
+
+    def update_overlay(self):
+        """
+        Show the latest frame statistics on the canvas, called once
+        per frame by the driver
+        :return:
+        """
+        if self.overlay is None or \
+                self.stats.last_summary is self.overlay_summary:
             return
-        else:
-            # Else, moves the image by the speed amount according
-            # to self.speed
-            # If there is an overlapped object and the object is
-            # farther along the x-axis don't move the image only moves
-            # the other overlapped object by self.speed+1 else if there
-            # is no overlapping object then moves the image by
-            # self.speed
-            #
-            # obj_id is a tuple that always contain at least 1
-            # coordinate
-            # If there is no overlap object, it still returns the obj_id
-            # of the closest image at boundary (x,y) and (x+20, y) which
-            # is image_id that why we check x != x1 if they
-            # are different then it mean there are indeed overlapping
-            # objects otherwise  just move the image at the normal speed
-            obj_id = self.canvas.find_overlapping(x,y,x+20,y)
-            x1, y1 = self.canvas.coords(obj_id[0])
-            if x != x1:
-                self.canvas.move(obj_id[0], self.speed+1, 0)
-            else:
-                self.canvas.move(image_id, self.speed, 0)
-            self.parent.after(20, lambda: self.animation(image_id))
+        self.overlay_summary = self.stats.last_summary
+        self.canvas.itemconfig(self.overlay,
+                               text=self.stats.overlay_text())
+        self.canvas.tag_raise(self.overlay)
 
+    def clear_sprites(self):
+        """
+        Stop drawing every moving image
+        :return:
+        """
+        for image_id in self.sprites:
+            self.backend.remove(image_id)
+            if self.exporter is not None:
+                self.exporter.remove(image_id)
+            if self.snapshot is not None:
+                self.snapshot.remove(image_id)
+        self.sprites.clear()
+        self.backend.draw([])
 
     def reset_func(self):
         """
         To reset, all info and data of the game. Start game from
         beginning
+        The widgets of the game page are kept and only their text is
+        reset, so resetting does not create or destroy any widget
         :return:
         """
-        # cancel all after method waiting to create new
-        # images on canvas and clear all moving animation
+        # drop the plan of images waiting to appear on canvas and
         # clear all moving animation
-        for after_id in self.list_of_after_id:
-            self.parent.after_cancel(after_id)
-        self.list_of_after_id.clear()
-        self.canvas.delete("all")
+        self.plan = None
+        self.clear_sprites()
 
         # reset everything to beginning
         self.new_round = True
         self.next_round = True
 
-        # reinitialize the score
-        self.current_score = 0
-        self.current_round = 1
-
-        if self.difficulty == 'easy':
-            self.current_lives = 3
-        elif self.difficulty == 'medium':
-            self.current_lives = 2
-        else:
-            self.current_lives = 1
+        # reinitialize the score, round and lives
+        self.engine.reset()
+        if self.recorder is not None:
+            self.recorder.reset()
 
-        self.canvas.destroy()
-        self.main_frame.destroy()
+        # show the first round state on the labels
+        self.num_lives.configure(text=f'Lives remain  {self.current_lives}')
+        self.num_round.configure(text=f'Round  {self.current_round}')
+        self.score.configure(text=f'Score  {self.current_score}')
+        self.next_round_button.configure(text="Start")
+        self.user_input.set('')
+        self.status.set('Press start to starts the first round!')
+        if self.image_on_count_canvas is not None:
+            self.count_canvas.itemconfig(self.image_on_count_canvas,
+                                         image='')
 
-        # call the start_game() method to restart the game
-        self.start_game()
+        # coming back from the end screen, hide it and show the game
+        if self.canvas1 is not None:
+            self.canvas1.grid_remove()
+            self.main_frame.grid()
 
     def end_game(self):
         """
         Get rid of everything and display the end screen with mystery
         event
+        The end screen canvas is created the first time and cleared and
+        shown again after that
         :return:
         """
+        if self.recorder is not None:
+            self.recorder.end(self.current_score)
+        if self.scores is not None:
+            self.scores.add(self.name, self.difficulty, self.current_score,
+                            self.current_round - 1)
+
+        # stop the round that may still be playing behind the end screen
+        self.plan = None
+        self.clear_sprites()
+
         self.main_frame.grid_forget()
-        self.canvas1 = tkinter.Canvas(self.parent, width=500, height=580,
-                                      background='white')
+        if self.canvas1 is None:
+            self.canvas1 = tkinter.Canvas(self.parent, width=500, height=580,
+                                          background='white')
+            # Attaches select method to button clicks on canvas
+            self.canvas1.bind("<Button-1>", self.select_to_delete)
+            self.play_again_button = tkinter.Button(self.canvas1,
+                                                    text="Play Again",
+                                                    command=self.reset_func)
+        else:
+            self.canvas1.delete("all")
         self.canvas1.grid()
         self.canvas1.create_text(250, 50, fill="goldenrod",
                                  font=('arial', 30, 'italic', 'bold'),
@@ -604,8 +1238,40 @@ class CountingGame:
                                                 'the box to uncover '
                                                 'your score...')
 
-        # Attaches select method to button clicks on canvas
-        self.canvas1.bind("<Button-1>", self.select_to_delete)
+        self.canvas1.create_window(250, 450, window=self.play_again_button)
+
+        # The best scores of this difficulty, read from the score index
+        if self.scores is not None:
+            best = self.scores.best(self.name, self.difficulty)
+            top = '   '.join(f'{place}. {player} {score}'
+                             for place, (player, score) in enumerate(
+                                 self.scores.top(self.difficulty), 1))
+            self.canvas1.create_text(250, 510, font=('arial', 10),
+                                     justify='center',
+                                     text=f'Your best {best}\n'
+                                          f'Best {self.difficulty}: {top}')
+
+    def close(self):
+        """
+        Stop the worker threads and close the files of the game
+        :return:
+        """
+        self.engine.close()
+        if self.stats is not None:
+            self.stats.close()
+        if self.recorder is not None:
+            self.recorder.close()
+        if self.scores is not None:
+            self.scores.close()
+        # Write the telemetry still queued before the process exits
+        if self.telemetry is not None:
+            self.telemetry.close()
+        # Write the frames still queued and finish the animation
+        if self.exporter is not None:
+            self.exporter.close()
+        # Leave the final state for the monitors
+        if self.snapshot is not None:
+            self.snapshot.close()
 
     def select_to_delete(self, event):
         """
@@ -622,10 +1288,59 @@ class CountingGame:
             self.parent.destroy()
 
 
+def split_screen(root, argv=None):
+    """
+    Put one board per player side by side in the window. Every board
+    keeps its own lives, round and score, and they all share one frame
+    loop and one set of decoded images
+    :param root: (tkinter.Tk) the root window object
+    :param argv: (list) the command line arguments, defaults to sys.argv
+    :return: (list) the CountingGame of every board
+    """
+    arguments = CountingGame.get_arguments(argv)
+    root.title("Counting Game")
+    root.geometry(f'{500 * arguments.players}x580')
+    driver = TickDriver(root, arguments.fps)
+    assets = AssetManager.shared(root, tkinter.PhotoImage)
+
+    # Every board plays the same rounds, from the same seed
+    seed = arguments.seed
+    if seed is None:
+        seed = random.randrange(2 ** 63)
+    board_argv = [arguments.difficulty, f'--fps={arguments.fps}',
+                  f'--seed={seed}', f'--backend={arguments.backend}']
+    if arguments.overlay:
+        board_argv.append('--overlay')
+    if arguments.server is not None:
+        board_argv.append(f'--server={arguments.server}')
+    if arguments.scores is not None:
+        board_argv.append(f'--scores={arguments.scores}')
+    if arguments.endless:
+        board_argv.append('--endless')
+    if arguments.frame_budget is not None:
+        board_argv.append(f'--frame-budget={arguments.frame_budget}')
+
+    games = []
+    for player in range(arguments.players):
+        board = tkinter.Frame(root)
+        board.grid(row=0, column=player, sticky='n')
+        name = f'{arguments.name} {player + 1}'
+        games.append(CountingGame(board, [board_argv[0], name]
+                                  + board_argv[1:], assets, driver))
+    return games
+
+
 def main():
+    # Check the arguments before opening the window
+    players = CountingGame.get_arguments().players
     root = tkinter.Tk()
-    game = CountingGame(root)
+    if players > 1:
+        games = split_screen(root)
+    else:
+        games = [CountingGame(root)]
     root.mainloop()
+    for game in games:
+        game.close()
 
 
 if __name__ == "__main__":
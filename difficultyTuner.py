@@ -0,0 +1,252 @@
+# ----------------------------------------------------------------------
+# Name:        The counting game difficulty tuner
+# Author:       Counting Game contributors
+# Purpose:     simulate bot players to tune the difficulty settings
+#
+# Date:       Fall 2026
+# ----------------------------------------------------------------------
+"""
+Difficulty tuner of the counting game
+
+Plays a large number of bot players through GameEngine for every
+combination of speed, lives and spawn interval given, spread over a
+process pool that uses every core. Each bot counts the copies of the
+image to count as they appear and can miss one, with a chance given by
+an error model:
+
+    fixed    the same chance for every copy
+    crowd    grows with the images already on screen
+    speed    grows with the speed of the images
+
+For every combination it reports the survival curve (the fraction of
+bots still alive after each round) and the distribution of round
+lengths (from the start of a round to the last image leaving):
+
+    python difficultyTuner.py --speeds 1 2 3 --lives 1 2 3 \\
+        --intervals 1000 1500 --bots 2000 --model crowd
+
+The full results are saved as JSON.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from gameEngine import GameEngine, STEP_MS, START_X, END_X
+
+# Round lengths are counted in bins of this many ms
+LENGTH_BIN = 500
+
+
+def miss_fixed(on_screen, speed, rate):
+    return rate
+
+
+def miss_crowd(on_screen, speed, rate):
+    return rate * on_screen
+
+
+def miss_speed(on_screen, speed, rate):
+    return rate * speed
+
+
+# The chance of missing one copy, from the images on screen when it
+# appears, the speed and the error rate
+ERROR_MODELS = {
+    'fixed': miss_fixed,
+    'crowd': miss_crowd,
+    'speed': miss_speed,
+}
+
+
+def get_arguments():
+    """
+    Parse and validate the command line arguments.
+    :return: (argparse.Namespace) the tuning settings
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--speeds', type=int, nargs='+', default=[1, 2],
+                        help='Speeds to try, in pixels per step')
+    parser.add_argument('--lives', type=int, nargs='+', default=[1, 2, 3],
+                        help='Lives to try')
+    parser.add_argument('--intervals', type=int, nargs='+', default=[1500],
+                        help='Spawn intervals to try, in ms')
+    parser.add_argument('--bots', type=int, default=1000,
+                        help='Bot players for each combination')
+    parser.add_argument('--model', choices=sorted(ERROR_MODELS),
+                        default='crowd', help='How the bots miss images')
+    parser.add_argument('--error-rate', type=float, default=0.01,
+                        help='Error rate given to the model')
+    parser.add_argument('--max-rounds', type=int, default=50,
+                        help='Rounds after which a bot stops playing')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help='Processes to simulate with')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Seed of the bots')
+    parser.add_argument('--output', default='tuning.json',
+                        help='Where to save the results')
+    arguments = parser.parse_args()
+    if min(arguments.speeds + arguments.lives + arguments.intervals) <= 0:
+        parser.error('speeds, lives and intervals must be positive')
+    if arguments.bots <= 0 or arguments.max_rounds <= 0:
+        parser.error('bots and max-rounds must be positive')
+    return arguments
+
+
+def play_bot(engine, miss, rate, rng, max_rounds, lengths):
+    """
+    Play one bot until it runs out of lives or max_rounds
+    :param engine: (GameEngine) a new game for the bot
+    :param miss: (function) the error model
+    :param rate: (float) the error rate given to the model
+    :param rng: (random.Random) decides which copies the bot misses
+    :param max_rounds: (int) the most rounds to play
+    :param lengths: (dict) count of rounds of each length bin, updated
+    :return: (int) how many rounds the bot answered
+    """
+    # ms an image takes to cross the canvas
+    travel = (END_X - START_X) / engine.speed * STEP_MS
+    while not engine.game_over and engine.round <= max_rounds:
+        state = engine.new_round()
+        # the times at which the last images appeared, oldest first,
+        # to count the ones still on screen
+        shown = []
+        first = 0
+        counted = 0
+        wait = 0
+        for wait, image, lane in state.plan:
+            while first < len(shown) and shown[first] <= wait - travel:
+                first += 1
+            if image == state.target and \
+                    rng.random() >= miss(len(shown) - first, engine.speed,
+                                         rate):
+                counted += 1
+            shown.append(wait)
+        length = int((wait + travel) // LENGTH_BIN)
+        lengths[length] = lengths.get(length, 0) + 1
+        engine.submit(counted)
+    return engine.round - 1
+
+
+def simulate(task):
+    """
+    Play a batch of bots with one combination of settings, runs in a
+    worker process
+    :param task: (tuple) the settings, the bot numbers and the tuning
+                 settings shared by every task
+    :return: tuple of the settings, how many bots stopped after each
+             number of rounds and how many rounds had each length
+    """
+    (speed, lives, interval), bots, model, rate, max_rounds, seed = task
+    miss = ERROR_MODELS[model]
+    stopped = [0] * (max_rounds + 1)
+    lengths = {}
+    for bot in bots:
+        engine = GameEngine(seed=seed * 1000003 + bot, lives=lives,
+                            speed=speed, interval=interval)
+        rng = random.Random(f'{seed}:{bot}:bot')
+        stopped[play_bot(engine, miss, rate, rng, max_rounds,
+                         lengths)] += 1
+    return (speed, lives, interval), stopped, lengths
+
+
+def summarize(stopped, lengths, bots):
+    """
+    Turn the counts of one combination into its curves
+    :param stopped: (list) how many bots stopped after each round
+    :param lengths: (dict) how many rounds had each length bin
+    :param bots: (int) how many bots played
+    :return: (dict)
+    """
+    # survival[n] is the fraction of bots alive after round n + 1, the
+    # ones that played every round stopped at the last one alive
+    survival = []
+    alive = bots
+    for count in stopped[1:-1]:
+        alive -= count
+        survival.append(alive / bots)
+    total = sum(lengths.values())
+    distribution = {str(length * LENGTH_BIN): count / total
+                    for length, count in sorted(lengths.items())}
+
+    def length_percentile(fraction):
+        seen = 0
+        for length, count in sorted(lengths.items()):
+            seen += count
+            if seen >= fraction * total:
+                return (length + 1) * LENGTH_BIN
+        return 0
+
+    median_rounds = next((number + 1 for number, fraction
+                          in enumerate(survival) if fraction < 0.5),
+                         len(stopped) - 1)
+    return {
+        'survival': survival,
+        'median_rounds': median_rounds,
+        'mean_rounds': sum(rounds * count for rounds, count
+                           in enumerate(stopped)) / bots,
+        'round_ms_distribution': distribution,
+        'round_ms_p50': length_percentile(0.50),
+        'round_ms_p90': length_percentile(0.90),
+    }
+
+
+def main():
+    settings = get_arguments()
+    grid = list(itertools.product(settings.speeds, settings.lives,
+                                  settings.intervals))
+    # Enough batches per combination to keep every worker busy to the
+    # end, but few enough that each one is worth sending to a process
+    batches = max(1, min(settings.bots, settings.workers * 4 // len(grid)))
+    tasks = [(combination, range(batch, settings.bots, batches),
+              settings.model, settings.error_rate, settings.max_rounds,
+              settings.seed)
+             for combination in grid for batch in range(batches)]
+
+    start = time.perf_counter()
+    stopped = {combination: [0] * (settings.max_rounds + 1)
+               for combination in grid}
+    lengths = {combination: {} for combination in grid}
+    with ProcessPoolExecutor(max_workers=settings.workers) as executor:
+        for combination, counts, histogram in executor.map(simulate, tasks):
+            for rounds, count in enumerate(counts):
+                stopped[combination][rounds] += count
+            for length, count in histogram.items():
+                lengths[combination][length] = \
+                    lengths[combination].get(length, 0) + count
+    elapsed = time.perf_counter() - start
+
+    results = []
+    print(f'{len(grid) * settings.bots} bots in {elapsed:.1f} s on '
+          f'{settings.workers} workers, model {settings.model} '
+          f'rate {settings.error_rate}')
+    print('speed lives interval  median rounds  mean rounds  '
+          'round ms p50  p90')
+    for speed, lives, interval in grid:
+        summary = summarize(stopped[speed, lives, interval],
+                            lengths[speed, lives, interval], settings.bots)
+        summary.update(speed=speed, lives=lives, interval=interval)
+        results.append(summary)
+        print(f"{speed:>5} {lives:>5} {interval:>8}  "
+              f"{summary['median_rounds']:>13}  "
+              f"{summary['mean_rounds']:>11.1f}  "
+              f"{summary['round_ms_p50']:>12} {summary['round_ms_p90']:>4}")
+
+    report = {
+        'model': settings.model,
+        'error_rate': settings.error_rate,
+        'bots': settings.bots,
+        'max_rounds': settings.max_rounds,
+        'seed': settings.seed,
+        'results': results,
+    }
+    with open(settings.output, 'w') as output:
+        json.dump(report, output, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+# ----------------------------------------------------------------------
+# Name:        Fake tkinter
+# Author:       Counting Game contributors
+# Purpose:     in-memory stand-in for the parts of tkinter the game uses
+#
+# Date:       Fall 2026
+# ----------------------------------------------------------------------
+"""
+In-memory stand-in for the parts of tkinter the counting game uses
+
+Lets CountingGame run without a display, for benchmarks and long
+running checks. Swap it in for the tkinter module that countingGame
+imported:
+
+    with unittest.mock.patch.object(countingGame, 'tkinter', fakeTkinter):
+        game = countingGame.CountingGame(fakeTkinter.Tk(), argv=[])
+
+Only Canvas keeps real state (items, coordinates, options and tags).
+Every widget knows its children and destroy takes it out of its
+parent, so widgets can be counted. Anything else a widget is asked to
+do is accepted and ignored.
+"""
+
+import itertools
+import traceback
+
+
+class Widget:
+
+    """
+    A widget that accepts any option and any method call
+
+    Argument:
+    master: the parent widget
+    options: the widget options
+
+    Attributes:
+        master: the parent widget
+        options (dict): the widget options
+        children (dict): the child widgets, by id
+    """
+
+    def __init__(self, master=None, **options):
+        self.master = master
+        self.options = options
+        self.children = {}
+        if master is not None:
+            master.children[id(self)] = self
+
+    def winfo_children(self):
+        return list(self.children.values())
+
+    def destroy(self):
+        for child in self.winfo_children():
+            child.destroy()
+        if self.master is not None:
+            self.master.children.pop(id(self), None)
+
+    def configure(self, **options):
+        self.options.update(options)
+
+    config = configure
+
+    def cget(self, option):
+        return self.options.get(option)
+
+    def __getattr__(self, name):
+        # grid, destroy, bind, focus and the like do nothing
+        def ignore(*args, **kwargs):
+            return None
+        return ignore
+
+
+# These widgets only ever need to accept what they are asked
+Frame = Label = Button = Entry = Widget
+
+
+class Tk(Widget):
+
+    """
+    The root window: keeps the after() callbacks but never runs them
+    by itself, call run_due to run the ones that are due
+
+    Attributes:
+        now (float): the current time in ms of the fake event loop
+        pending (dict): (due time, function, arguments) of each after ID
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.now = 0
+        self.pending = {}
+        self.ids = itertools.count(1)
+
+    def after(self, ms, function=None, *args):
+        after_id = f'after#{next(self.ids)}'
+        self.pending[after_id] = (self.now + ms, function, args)
+        return after_id
+
+    def after_idle(self, function, *args):
+        return self.after(0, function, *args)
+
+    def after_cancel(self, after_id):
+        self.pending.pop(after_id, None)
+
+    def after_info(self):
+        return tuple(self.pending)
+
+    def report_callback_exception(self, exc, value, trace):
+        """
+        Print a callback error the way tkinter does
+        :param exc: the exception class
+        :param value: the exception
+        :param trace: the traceback
+        :return:
+        """
+        traceback.print_exception(exc, value, trace)
+
+    def run_due(self, now):
+        """
+        Move the fake event loop to now and run every due callback
+        :param now: (float) the new time in ms
+        :return:
+        """
+        self.now = now
+        due = sorted((when, after_id) for after_id, (when, function, args)
+                     in self.pending.items() if when <= now)
+        for when, after_id in due:
+            if after_id in self.pending:
+                when, function, args = self.pending.pop(after_id)
+                function(*args)
+
+
+class StringVar:
+
+    """
+    Holds a string like tkinter.StringVar
+    """
+
+    def __init__(self, master=None, value=''):
+        self.value = value
+
+    def set(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+
+class Interpreter:
+
+    """
+    The Tcl commands of one image, only data is answered
+
+    Argument:
+    image (PhotoImage): the image
+
+    Attributes:
+        image (PhotoImage): the image
+    """
+
+    def __init__(self, image):
+        self.image = image
+
+    def call(self, *args):
+        if args[1:2] != ('data',):
+            return ''
+        # a list of rows of pixel colors, like tkinter gives it
+        row = ('#808080',) * self.image.width()
+        return (row,) * self.image.height()
+
+    @staticmethod
+    def splitlist(value):
+        return value if isinstance(value, tuple) else tuple(value.split())
+
+
+class PhotoImage:
+
+    """
+    An image that remembers where it came from, every pixel of it is
+    the same opaque grey
+    """
+
+    names = itertools.count(1)
+
+    def __init__(self, name=None, master=None, **options):
+        self.name = name or f'pyimage{next(self.names)}'
+        self.options = options
+        self.tk = Interpreter(self)
+
+    def __str__(self):
+        return self.name
+
+    def configure(self, **options):
+        self.options.update(options)
+
+    def width(self):
+        return self.options.get('width', 40)
+
+    def height(self):
+        return self.options.get('height', 40)
+
+
+class Canvas(Widget):
+
+    """
+    A canvas that keeps its items in a dictionary
+
+    Attributes:
+        items (dict): [coordinates, options, tags] of each item id
+    """
+
+    def __init__(self, master=None, **options):
+        super().__init__(master, **options)
+        self.items = {}
+        self.ids = itertools.count(1)
+
+    def create(self, coords, options):
+        item = next(self.ids)
+        tags = options.pop('tags', ())
+        if isinstance(tags, str):
+            tags = tags.split()
+        self.items[item] = [list(coords), options, set(tags)]
+        return item
+
+    def create_image(self, *coords, **options):
+        return self.create(coords, options)
+
+    create_text = create_rectangle = create_polygon = create_image
+
+    def find(self, tag_or_id):
+        """
+        The items matching an item id, a tag, 'all' or tags joined
+        with &&
+        :param tag_or_id: the item id or tag
+        :return: (list) the matching item ids
+        """
+        if isinstance(tag_or_id, int):
+            return [tag_or_id] if tag_or_id in self.items else []
+        if tag_or_id == 'all':
+            return list(self.items)
+        if tag_or_id.isdigit():
+            return self.find(int(tag_or_id))
+        tags = set(tag_or_id.split('&&'))
+        return [item for item, (coords, options, item_tags)
+                in self.items.items() if tags <= item_tags]
+
+    def find_all(self):
+        return tuple(self.items)
+
+    def find_withtag(self, tag_or_id):
+        return tuple(self.find(tag_or_id))
+
+    def find_overlapping(self, x1, y1, x2, y2):
+        found = []
+        for item, (coords, options, tags) in self.items.items():
+            if options.get('state') == 'hidden' or len(coords) < 2:
+                continue
+            # every item is treated as a 40 by 40 square
+            x, y = coords[0], coords[1]
+            if x - 20 <= x2 and x + 20 >= x1 and \
+                    y - 20 <= y2 and y + 20 >= y1:
+                found.append(item)
+        return tuple(found)
+
+    def coords(self, tag_or_id, *coords):
+        found = self.find(tag_or_id)
+        if not coords:
+            return list(self.items[found[0]][0]) if found else []
+        if len(coords) == 1:
+            coords = coords[0]
+        for item in found[:1]:
+            self.items[item][0] = list(coords)
+
+    def move(self, tag_or_id, dx, dy):
+        for item in self.find(tag_or_id):
+            coords = self.items[item][0]
+            for index in range(0, len(coords), 2):
+                coords[index] += dx
+                coords[index + 1] += dy
+
+    def itemconfig(self, tag_or_id, **options):
+        for item in self.find(tag_or_id):
+            if 'tags' in options:
+                tags = options['tags']
+                if isinstance(tags, str):
+                    tags = tags.split()
+                self.items[item][2] = set(tags)
+            self.items[item][1].update((name, value) for name, value
+                                       in options.items() if name != 'tags')
+
+    itemconfigure = itemconfig
+
+    def itemcget(self, tag_or_id, option):
+        found = self.find(tag_or_id)
+        if option == 'tags':
+            return ' '.join(sorted(self.items[found[0]][2]))
+        return self.items[found[0]][1].get(option, '')
+
+    def gettags(self, tag_or_id):
+        found = self.find(tag_or_id)
+        return tuple(sorted(self.items[found[0]][2])) if found else ()
+
+    def addtag_withtag(self, new_tag, tag_or_id):
+        for item in self.find(tag_or_id):
+            self.items[item][2].add(new_tag)
+
+    def dtag(self, tag_or_id, tag=None):
+        tag = tag_or_id if tag is None else tag
+        for item in self.find(tag_or_id):
+            self.items[item][2].discard(tag)
+
+    def delete(self, *tags_or_ids):
+        for tag_or_id in tags_or_ids:
+            for item in self.find(tag_or_id):
+                del self.items[item]
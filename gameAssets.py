@@ -0,0 +1,139 @@
+# ----------------------------------------------------------------------
+# Name:        The counting game assets
+# Author:       Counting Game contributors
+# Purpose:     load the game images once and share them
+#
+# Date:       Fall 2026
+# ----------------------------------------------------------------------
+"""
+Lazy loading and sharing of the counting game images
+
+Decoding the GIFs is the slowest part of starting the game, and the
+images are not needed until the first round. AssetManager decodes an
+image the first time it is asked for, or ahead of time from tkinter
+idle callbacks once the window is on screen. Decoded images are kept
+per root window and shared by every game drawn in it, across resets.
+
+The buffer backend and the frame exporter draw the images themselves
+and need their pixels. read_pixels reads a whole image with two calls
+to Tcl, and the manager keeps what it read for both of them.
+"""
+
+import time
+import tkinter
+import weakref
+
+from gameEngine import IMAGE_FILES
+
+
+def read_pixels(obj):
+    """
+    Read every pixel of an image from tkinter, must run on the Tk
+    thread. The data of an image gives its transparent pixels the
+    background color asked for, so the pixels that differ between a
+    black and a white background are the transparent ones
+    :param obj: (tkinter.PhotoImage) the image
+    :return: tuple of the width, the height and for every row the RGB
+             bytes of each pixel, None where it is transparent
+    """
+    reads = []
+    for background in ('#000000', '#ffffff'):
+        data = obj.tk.call(str(obj), 'data', '-background', background)
+        reads.append([obj.tk.splitlist(row)
+                      for row in obj.tk.splitlist(data)])
+    rows = [[bytes.fromhex(dark[1:]) if dark == light else None
+             for dark, light in zip(dark_row, light_row)]
+            for dark_row, light_row in zip(*reads)]
+    return obj.width(), obj.height(), rows
+
+
+class AssetManager:
+
+    """
+    Decodes the game images on first use and keeps them
+
+    tkinter images belong to one Tcl interpreter, so there is one
+    manager per root window, see shared
+
+    Argument:
+    root (tkinter.Tk): the root window the images belong to
+    files (tuple): the image files, in index order
+    loader (class): decodes a file, defaults to tkinter.PhotoImage
+
+    Attributes:
+        root (weakref.ref): the root window the images belong to, weak
+                            so the manager does not keep it alive
+        files (tuple): the image files, in index order
+        loader (class): decodes a file
+        images (list): the decoded image of each file, None until it is
+                       decoded
+        decode_ms (float): total time spent decoding images in ms
+        pixels (dict): what read_pixels gave for each image, by image
+                       name
+    """
+
+    # the manager of each root window, forgotten with the window
+    managers = weakref.WeakKeyDictionary()
+
+    def __init__(self, root, files=IMAGE_FILES, loader=None):
+        self.root = weakref.ref(root)
+        self.files = files
+        self.loader = tkinter.PhotoImage if loader is None else loader
+        self.images = [None] * len(files)
+        self.decode_ms = 0.0
+        self.pixels = {}
+
+    @classmethod
+    def shared(cls, root, loader=None):
+        """
+        The manager every game in a root window shares
+        :param root: (tkinter.Tk) the root window
+        :param loader: (class) decodes a file, used when the manager is
+                       created
+        :return: (AssetManager)
+        """
+        if root not in cls.managers:
+            cls.managers[root] = cls(root, loader=loader)
+        return cls.managers[root]
+
+    def get(self, index):
+        """
+        The decoded image of a file, decoding it if needed
+        :param index: (int) the index of the image
+        :return: (tkinter.PhotoImage)
+        """
+        if self.images[index] is None:
+            start = time.perf_counter()
+            self.images[index] = self.loader(file=self.files[index],
+                                             master=self.root())
+            self.decode_ms += (time.perf_counter() - start) * 1000
+        return self.images[index]
+
+    def all(self):
+        """
+        Every image, decoding the ones still missing
+        :return: (list) the decoded images in index order
+        """
+        return [self.get(index) for index in range(len(self.files))]
+
+    def pixels_of(self, obj):
+        """
+        The pixels of an image, read from tkinter the first time
+        :param obj: (tkinter.PhotoImage) the image
+        :return: tuple of the width, the height and the rows of pixels,
+                 see read_pixels
+        """
+        name = str(obj)
+        if name not in self.pixels:
+            self.pixels[name] = read_pixels(obj)
+        return self.pixels[name]
+
+    def preload(self):
+        """
+        Decode the missing images one per idle callback so the window
+        keeps responding while they load
+        :return:
+        """
+        for index in range(len(self.files)):
+            if self.images[index] is None:
+                self.root().after_idle(self.get, index)
@@ -0,0 +1,557 @@
+# ----------------------------------------------------------------------
+# Name:        The counting game engine
+# Author:       Counting Game contributors
+# Purpose:     rules of the counting game without any user interface
+#
+# Date:       Fall 2026
+# ----------------------------------------------------------------------
+"""
+Rules of the counting game, kept apart from tkinter
+
+GameEngine holds the lives, round and score of one player, makes each
+round and scores the answers. Every random choice comes from the
+session seed, so a session can be played again exactly. CountingGame
+only draws what the engine decides, so the same rules can run without a
+display, for example to simulate a large number of rounds in a test, a
+load run or the difficulty tuner. The lives, speed and spawn interval
+come from the difficulty unless they are given. In endless mode a
+wrong answer costs no life, so the rounds keep growing.
+
+With prefetch on, the next round is made in a worker thread while the
+current one is played. A round only depends on the session seed, its
+number and how many rounds came before it, so the prefetched round is
+the same one new_round would have made.
+
+Each round plans the lane of every copy so no two images ever overlap
+on screen, and check_plan proves it. Many rounds can be checked with:
+
+    python gameEngine.py --rounds 500 --seeds 20
+
+When NumPy is installed, generate_rounds and score_rounds make and
+score whole arrays of rounds at once.
+"""
+
+import argparse
+import os
+import random
+import heapq
+import collections
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Lives and speed (pixels per frame) for each difficulty
+# Easy - 3 lives, 1 pixel speed
+# Medium - 2 lives, 2 pixel speed
+# Hard - 1 live, 2 pixel speed
+DIFFICULTIES = {
+    'easy': {'lives': 3, 'speed': 1},
+    'medium': {'lives': 2, 'speed': 2},
+    'hard': {'lives': 1, 'speed': 2},
+}
+
+# The images to count, in the order of their index in the game
+IMAGE_FILES = ('SpartanSpirit.gif', 'butterfly.gif', 'logo1.gif',
+               'logo2.gif')
+
+# How many different images there are to count
+NUM_IMAGES = len(IMAGE_FILES)
+
+# How many lanes the images can move along
+NUM_LANES = 4
+
+# y coordinate of each lane on the canvas
+LANES = (50, 125, 200, 275)
+
+# Size of the game canvas
+WIDTH = 500
+HEIGHT = 350
+
+# The first copy of each image appears after a random wait (in ms)
+# picked from its range, then one more copy every SPAWN_INTERVAL ms
+FIRST_SPAWN = ((500, 1000), (300, 500), (500, 1000), (600, 1000))
+SPAWN_INTERVAL = 1500
+
+# The game is simulated in steps of STEP_MS ms, the speed of the images
+# is in pixels per step and a copy appears at the first step at or
+# after its wait
+STEP_MS = 20
+
+# x coordinate where images appear and where they leave the canvas
+START_X = 25
+END_X = 520
+
+# Pixels of background kept between two images in a lane
+OVERLAP_MARGIN = 5
+
+
+def image_width(name):
+    """
+    The width of a GIF image, read from its header without decoding it
+    :param name: (String) the file name, next to this module
+    :return: (int) the width in pixels
+    """
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), name)
+    with open(path, 'rb') as file:
+        header = file.read(8)
+    # GIF87a or GIF89a, then the width as a little-endian short
+    return int.from_bytes(header[6:8], 'little')
+
+
+# How close (in pixels) an image can be behind the one ahead in its
+# lane before the two overlap: images are drawn centered on their x,
+# so two of them overlap when they are closer than the widest image
+OVERLAP_DISTANCE = max(map(image_width, IMAGE_FILES)) + OVERLAP_MARGIN
+
+
+def lane_spacing(speed):
+    """
+    The least ms between two copies appearing in the same lane, so the
+    first one is more than OVERLAP_DISTANCE ahead when the second one
+    appears. Every image moves at the same speed, so the gap between
+    them stays the same until they leave
+    :param speed: (int) the pixels per step of every image
+    :return: (int) ms, a whole number of steps
+    """
+    return (OVERLAP_DISTANCE // speed + 1) * STEP_MS
+
+
+def appear_step(wait):
+    """
+    The step a copy appears at, the first step at or after its wait
+    :param wait: (float) the wait in ms from the start of the round
+    :return: (int) the step number, from 1
+    """
+    return max(1, -(-wait // STEP_MS))
+
+
+class RoundPlan:
+
+    """
+    Time sorted schedule of when and in which lane each image of a
+    round appears
+
+    Each image has its own stream of copies, one every interval ms
+    from its first wait. Only the next copy of each stream is kept, in
+    a heap, so the plan is the same small size whatever the round
+    number and the copies are planned only when they are due, or all
+    at once ahead of time by prepare
+
+    The lanes are planned so that no two copies ever overlap: a copy
+    goes to a lane picked at random among the lanes whose last copy
+    is at least spacing ms older. When every lane is busy the copy
+    waits for the first lane to be free, so no copy is ever dropped.
+    Every wait is a whole number of steps, so the copies of a lane
+    appear at least spacing ms apart, which check_plan proves
+
+    Argument:
+    first_waits (list): the wait in ms before the first copy of each
+                        image
+    counts (list): how many copies of each image appear
+    rng (random.Random): the generator of the round
+    interval (int): the wait in ms between two copies of an image
+    spacing (int): the least ms between two copies in the same lane,
+                   from lane_spacing, 0 for no limit
+
+    Attributes:
+        heap (list): (wait in ms, image index, copies left) of the next
+                     copy of every image that still has copies
+        rng (random.Random): picks the lane of each copy
+        interval (int): the wait in ms between two copies of an image
+        spacing (int): the least ms between two copies in the same lane
+        free (list): for each lane, the wait in ms from which a copy
+                     may appear in it
+        remaining (int): how many copies have not appeared yet
+        schedule (deque): (wait in ms, image index, lane) of every copy
+                          still to appear, None until prepare plans them
+    """
+
+    __slots__ = ('heap', 'rng', 'interval', 'spacing', 'free', 'remaining',
+                 'schedule')
+
+    def __init__(self, first_waits, counts, rng, interval=SPAWN_INTERVAL,
+                 spacing=0):
+        # Waits are rounded up to a step, a copy appears at the same
+        # step either way
+        self.heap = [(appear_step(wait) * STEP_MS, image, count)
+                     for image, (wait, count)
+                     in enumerate(zip(first_waits, counts)) if count > 0]
+        heapq.heapify(self.heap)
+        self.rng = rng
+        self.interval = appear_step(interval) * STEP_MS
+        self.spacing = spacing
+        self.free = [0] * NUM_LANES
+        self.remaining = sum(counts)
+        self.schedule = None
+
+    def place(self, elapsed):
+        """
+        Plan every copy that can appear by a time: pick its lane, or
+        move it later when every lane is busy
+        :param elapsed: (float) ms since the round started
+        :return: generator of (wait in ms, image index, lane) of each
+                 copy, in order
+        """
+        heap = self.heap
+        free = self.free
+        while heap and heap[0][0] <= elapsed:
+            wait, image, count = heap[0]
+            lanes = [lane for lane in range(NUM_LANES) if free[lane] <= wait]
+            if not lanes:
+                # Every lane is busy, wait for the first one to be free
+                heapq.heapreplace(heap, (min(free), image, count))
+                continue
+            lane = lanes[self.rng.randint(0, len(lanes) - 1)]
+            free[lane] = wait + self.spacing
+            if count > 1:
+                heapq.heapreplace(heap, (wait + self.interval, image,
+                                         count - 1))
+            else:
+                heapq.heappop(heap)
+            yield wait, image, lane
+
+    def prepare(self):
+        """
+        Plan every copy now instead of when it appears. The copies are
+        planned in a fixed order and nothing else draws from the
+        generator, so the plan is the same either way
+        :return:
+        """
+        if self.schedule is None:
+            self.schedule = collections.deque(self.place(float('inf')))
+
+    @property
+    def next_wait(self):
+        """
+        The wait in ms of the next copy, None when every copy appeared
+        """
+        if self.schedule is not None:
+            return self.schedule[0][0] if self.schedule else None
+        return self.heap[0][0] if self.heap else None
+
+    def due(self, elapsed):
+        """
+        Take every copy that should have appeared by now
+        :param elapsed: (float) ms since the round started
+        :return: generator of (image index, lane) of each copy, in order
+        """
+        if self.schedule is not None:
+            schedule = self.schedule
+            while schedule and schedule[0][0] <= elapsed:
+                wait, image, lane = schedule.popleft()
+                self.remaining -= 1
+                yield image, lane
+        else:
+            for wait, image, lane in self.place(elapsed):
+                self.remaining -= 1
+                yield image, lane
+
+    def __iter__(self):
+        """
+        Every copy of the plan without consuming it
+        :return: generator of (wait in ms, image index, lane), in order
+        """
+        if self.schedule is not None:
+            yield from list(self.schedule)
+            return
+        rng = random.Random()
+        rng.setstate(self.rng.getstate())
+        copy = RoundPlan([], [], rng, self.interval, self.spacing)
+        copy.heap = list(self.heap)
+        copy.free = list(self.free)
+        yield from copy.place(float('inf'))
+
+
+def check_plan(spawns, speed, counts=None):
+    """
+    Prove that a round plan never overlaps. Every image moves speed
+    pixels per step from the step it appears at, so two copies in a
+    lane keep the gap they start with: the steps between them times
+    speed, which has to be more than OVERLAP_DISTANCE
+    :param spawns: (iterable) (wait in ms, image index, lane) of every
+                   copy in order, a RoundPlan for example
+    :param speed: (int) the pixels per step of every image
+    :param counts: (list) how many copies of each image the round has,
+                   to check that none was lost
+    :return: (int) how many copies were checked
+    :raise ValueError: on the first copy that overlaps or is missing
+    """
+    last_step = {}
+    seen = [0] * NUM_IMAGES
+    previous = 0
+    checked = 0
+    for wait, image, lane in spawns:
+        if wait < previous:
+            raise ValueError(f'the copy at {wait} ms comes after one at '
+                             f'{previous} ms')
+        step = appear_step(wait)
+        if lane in last_step:
+            gap = (step - last_step[lane]) * speed
+            if gap <= OVERLAP_DISTANCE:
+                raise ValueError(f'lane {lane}: the copy at {wait} ms is '
+                                 f'{gap} pixels behind the one ahead')
+        last_step[lane] = step
+        seen[image] += 1
+        previous = wait
+        checked += 1
+    if counts is not None and seen != list(counts):
+        raise ValueError(f'the plan has {seen} copies of each image, the '
+                         f'round {list(counts)}')
+    return checked
+
+
+class RoundState:
+
+    """
+    Everything decided at the start of one round
+
+    Argument:
+    number (int): the round number
+    target (int): the index of the image to count
+    counts (list): how many copies of each image appear
+    plan (RoundPlan): when every copy appears
+
+    Attributes:
+        number (int): the round number
+        target (int): the index of the image to count
+        counts (list): how many copies of each image appear
+        plan (RoundPlan): when every copy appears
+        answer (int): the correct answer for this round
+    """
+
+    __slots__ = ('number', 'target', 'counts', 'plan')
+
+    def __init__(self, number, target, counts, plan):
+        self.number = number
+        self.target = target
+        self.counts = counts
+        self.plan = plan
+
+    @property
+    def answer(self):
+        return self.counts[self.target]
+
+
+class GameEngine:
+
+    """
+    The state and rules of one game
+
+    Argument:
+    difficulty (String): one of the keys of DIFFICULTIES
+    seed (int): the session seed, a random one when None
+    prefetch (boolean): True to make the next round in a worker thread
+    lives (int): the lives of a new game, from the difficulty when None
+    speed (int): the speed of animation, from the difficulty when None
+    interval (int): the wait in ms between two copies of an image
+    endless (boolean): True if wrong answers cost no life
+
+    Attributes:
+        difficulty (String): hold the difficulty mode
+        seed (int): the session seed every round is generated from
+        plans (int): how many rounds have been generated so far, each
+                     one gets its own generator seeded from the session
+                     seed and this number
+        speed (int): the speed of animation
+        max_lives (int): the lives of a new game
+        interval (int): the wait in ms between two copies of an image
+        endless (boolean): True if wrong answers cost no life
+        lives (int): hold the player's lives
+        round (int): hold the current round that player is play
+        score (int): hold the score that player has earn
+        current (RoundState): the round being played, None before the
+                              first round
+        executor (ThreadPoolExecutor): the worker that makes the next
+                                       round, None without prefetch
+        upcoming (tuple): (round number, plans, future) of the round
+                          being made ahead, None when there is none
+    """
+
+    # A server holds one engine per session, so keep them small
+    __slots__ = ('difficulty', 'seed', 'plans', 'speed', 'max_lives',
+                 'interval', 'endless', 'executor', 'upcoming', 'lives',
+                 'round', 'score', 'current')
+
+    def __init__(self, difficulty='easy', seed=None, prefetch=False,
+                 lives=None, speed=None, interval=SPAWN_INTERVAL,
+                 endless=False):
+        self.difficulty = difficulty
+        if seed is None:
+            seed = random.randrange(2 ** 63)
+        self.seed = seed
+        self.plans = 0
+        if lives is None:
+            lives = DIFFICULTIES[difficulty]['lives']
+        if speed is None:
+            speed = DIFFICULTIES[difficulty]['speed']
+        self.max_lives = lives
+        self.speed = speed
+        self.interval = interval
+        self.endless = endless
+        self.executor = None
+        if prefetch:
+            self.executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix='round-prefetch')
+        self.upcoming = None
+        self.reset()
+
+    def reset(self):
+        """
+        Start the game again from the first round
+        :return:
+        """
+        self.lives = self.max_lives
+        self.round = 1
+        self.score = 0
+        self.current = None
+        self.prefetch(self.round)
+
+    @property
+    def game_over(self):
+        return self.lives <= 0
+
+    def make_round(self, number, plans, prepare=False):
+        """
+        Pick the image to count, how many copies of each image appear
+        and when each copy appears. Only reads the session seed, so it
+        can run in the worker thread
+        :param number: (int) the round number
+        :param plans: (int) how many rounds were made before this one
+        :param prepare: (boolean) True to draw every lane now as well
+        :return: (RoundState) the round
+        """
+        rng = random.Random(f'{self.seed}:{plans}')
+        randint = rng.randint
+        target = randint(0, NUM_IMAGES - 1)
+        counts = [randint(1, number + 1) for image in range(NUM_IMAGES)]
+
+        # Each image has its own stream of copies: a random first wait
+        # then one copy every interval ms
+        first_waits = [randint(*FIRST_SPAWN[image])
+                       for image in range(NUM_IMAGES)]
+        plan = RoundPlan(first_waits, counts, rng, self.interval,
+                         lane_spacing(self.speed))
+        if prepare:
+            plan.prepare()
+        return RoundState(number, target, counts, plan)
+
+    def prefetch(self, number):
+        """
+        Start making the round that comes next in the worker thread,
+        replacing the one made ahead before
+        :param number: (int) the round number it will have
+        :return:
+        """
+        if self.executor is None:
+            return
+        if self.upcoming is not None:
+            self.upcoming[2].cancel()
+        future = self.executor.submit(self.make_round, number, self.plans,
+                                      True)
+        self.upcoming = (number, self.plans, future)
+
+    def new_round(self):
+        """
+        Start the next round, the one made ahead if it is the right one
+        :return: (RoundState) the new round
+        """
+        upcoming, self.upcoming = self.upcoming, None
+        if upcoming is not None and upcoming[:2] == (self.round, self.plans):
+            self.current = upcoming[2].result()
+        else:
+            # The round number was changed by hand, make it here
+            if upcoming is not None:
+                upcoming[2].cancel()
+            self.current = self.make_round(self.round, self.plans)
+        self.plans += 1
+        # Every answer moves on one round, so the next one is known
+        self.prefetch(self.round + 1)
+        return self.current
+
+    def submit(self, answer):
+        """
+        Score the player's answer and move on to the next round
+        :param answer: (int) the player's answer
+        :return: (boolean) True if the answer is correct
+        """
+        correct = answer == self.current.answer
+        self.round += 1
+        if correct:
+            self.score += 1
+        elif not self.endless:
+            self.lives -= 1
+        return correct
+
+    def close(self):
+        """
+        Stop the worker thread
+        :return:
+        """
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+            self.upcoming = None
+
+
+def generate_rounds(round_numbers, seed=None):
+    """
+    Make many rounds at once with the same rules as
+    GameEngine.new_round, without the spawn times
+    :param round_numbers: (array of int) the round number of each round
+    :param seed: (int) seed for the NumPy random generator
+    :return: tuple of the target index (n,), the counts (n, NUM_IMAGES)
+             and the correct answer (n,) of every round
+    """
+    if numpy is None:
+        raise RuntimeError('generate_rounds needs NumPy installed')
+    rng = numpy.random.default_rng(seed)
+    round_numbers = numpy.asarray(round_numbers)
+    size = len(round_numbers)
+    targets = rng.integers(0, NUM_IMAGES, size=size)
+    # integers excludes the upper bound so this is randint(1, round+1)
+    counts = rng.integers(1, round_numbers[:, None] + 2,
+                          size=(size, NUM_IMAGES))
+    answers = counts[numpy.arange(size), targets]
+    return targets, counts, answers
+
+
+def score_rounds(answers, guesses):
+    """
+    Score many answers at once with the same rules as GameEngine.submit
+    :param answers: (array of int) the correct answer of every round
+    :param guesses: (array of int) the player's answer of every round
+    :return: (array of bool) True where the guess is correct
+    """
+    if numpy is None:
+        raise RuntimeError('score_rounds needs NumPy installed')
+    return numpy.asarray(answers) == numpy.asarray(guesses)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Check that the rounds of every difficulty never '
+                    'overlap')
+    parser.add_argument('--rounds', type=int, default=200,
+                        help='Rounds to check for each seed')
+    parser.add_argument('--seeds', type=int, default=20,
+                        help='Sessions to check for each difficulty')
+    arguments = parser.parse_args()
+
+    rounds = copies = 0
+    for difficulty in DIFFICULTIES:
+        for seed in range(arguments.seeds):
+            engine = GameEngine(difficulty, seed)
+            for number in range(1, arguments.rounds + 1):
+                engine.round = number
+                state = engine.new_round()
+                copies += check_plan(state.plan, engine.speed, state.counts)
+                rounds += 1
+    print(f'{rounds} rounds, {copies} copies: no overlap, every copy more '
+          f'than {OVERLAP_DISTANCE} pixels behind the one ahead')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,498 @@
+# ----------------------------------------------------------------------
+# Name:        The counting game frame exporter
+# Author:       Counting Game contributors
+# Purpose:     save the frames of a session as an animation
+#
+# Date:       Fall 2026
+# ----------------------------------------------------------------------
+"""
+Save the game canvas of a session as an animated PNG or PNG sequence
+
+The frames are not screenshots of Tk. The game hands the exporter where
+every image is (handle, lane and x), a few bytes per image, and a
+worker thread draws the frame off-screen from that and encodes it:
+
+    FILE.png     one animated PNG (APNG). Only the rectangle around
+                 the images that moved is stored for each frame, and a
+                 frame that did not change only makes the one before
+                 it last longer
+    DIRECTORY    one full PNG per frame that changed, with frames.txt
+                 listing each file and how many ms it is shown
+
+The worker gets the frames through a small queue. When it falls behind
+the game drops frames from the recording instead of waiting, so
+recording never slows down animation, and memory stays the same however
+long the session is: one frame buffer, one encoded frame waiting to be
+written and the queue.
+"""
+
+import os
+import queue
+import struct
+import threading
+import zlib
+
+from gameAssets import read_pixels
+from gameEngine import LANES, WIDTH, HEIGHT
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+# The longest an APNG frame can last, in frames, its delay is 16 bits
+MAX_DELAY = 0xFFFF
+
+
+def chunk(kind, data):
+    """
+    One PNG chunk
+    :param kind: (bytes) the chunk type
+    :param data: (bytes) the chunk data
+    :return: (bytes)
+    """
+    return (struct.pack('>I', len(data)) + kind + data
+            + struct.pack('>I', zlib.crc32(kind + data)))
+
+
+def header(width, height):
+    """
+    The IHDR chunk of an 8 bit RGB image
+    :param width: (int)
+    :param height: (int)
+    :return: (bytes)
+    """
+    return chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2,
+                                      0, 0, 0))
+
+
+def opaque_runs(pixels):
+    """
+    The runs of opaque pixels of an image
+    :param pixels: (tuple) the width, the height and the rows of pixels
+                   of the image, from gameAssets.read_pixels
+    :return: tuple of the width, the height and for every row the list
+             of (first x, end x, RGB bytes) of each run of opaque pixels
+    """
+    width, height, colors = pixels
+    rows = []
+    for row in colors:
+        runs = []
+        start = None
+        for x, color in enumerate(list(row) + [None]):
+            if color is not None:
+                if start is None:
+                    start = x
+                    run = bytearray()
+                run.extend(color)
+            elif start is not None:
+                runs.append((start, x, bytes(run)))
+                start = None
+        rows.append(runs)
+    return width, height, rows
+
+
+class FrameExporter:
+
+    """
+    Records the frames of the game canvas to an animation
+
+    Argument:
+    path (String): FILE.png for an animated PNG, else a directory for a
+                   PNG sequence
+    fps (int): how many frames per second to record
+    width (int): the width of the canvas
+    height (int): the height of the canvas
+    queue_size (int): how many frames may wait for the worker
+    pixels (function): gives the pixels of an image, defaults to
+                       gameAssets.read_pixels
+
+    Attributes:
+        path (String): where the animation goes
+        animated (boolean): True for an animated PNG
+        fps (int): how many frames per second to record
+        width (int): the width of the canvas
+        height (int): the height of the canvas
+        pixels (function): gives the pixels of an image
+        bitmaps (dict): (width, height, opaque runs) of every image
+                        drawn so far, by image name
+        sprites (dict): the image name of each handle
+        start (float): the clock time of the first frame
+        tick (int): the number of the next frame due
+        queue (queue.Queue): the frames waiting for the worker, None
+                             once the exporter is closed
+        output (AnimatedPNG or PNGSequence): writes the frames
+        worker (threading.Thread): draws and encodes the frames
+        captured (int): how many frames were handed to the worker
+        dropped (int): how many frames were dropped, the worker being
+                       behind
+        written (int): how many frames were written
+    """
+
+    def __init__(self, path, fps=25, width=WIDTH, height=HEIGHT,
+                 queue_size=8, pixels=read_pixels):
+        self.path = path
+        self.pixels = pixels
+        self.animated = path.lower().endswith('.png')
+        self.fps = fps
+        self.width = width
+        self.height = height
+        self.bitmaps = {}
+        self.sprites = {}
+        self.start = None
+        self.tick = 0
+        self.captured = 0
+        self.dropped = 0
+        self.written = 0
+        # Opened here so a bad path fails when the game starts
+        if self.animated:
+            self.output = AnimatedPNG(path, width, height, fps)
+        else:
+            self.output = PNGSequence(path, width, height, fps)
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.worker = threading.Thread(target=self.work, args=(self.queue,),
+                                       daemon=True, name='frame-exporter')
+        self.worker.start()
+
+    def add(self, handle, obj):
+        """
+        Start recording an image, its runs are made the first time the
+        image is seen
+        :param handle: the handle of the image from the render backend
+        :param obj: (tkinter.PhotoImage) the image
+        :return:
+        """
+        name = str(obj)
+        if name not in self.bitmaps:
+            self.bitmaps[name] = opaque_runs(self.pixels(obj))
+        self.sprites[handle] = name
+
+    def remove(self, handle):
+        """
+        Stop recording an image
+        :param handle: the handle given to add
+        :return:
+        """
+        del self.sprites[handle]
+
+    def capture(self, now, positions):
+        """
+        Hand the frame to the worker if one is due, never waits
+        :param now: (float) the clock time in seconds
+        :param positions: (list) (handle, lane, x) of every image
+        :return:
+        """
+        if self.queue is None:
+            return
+        if self.start is None:
+            self.start = now
+        # Frames are numbered by the clock, so a frame the game was too
+        # busy to draw makes the one before it last longer
+        tick = int((now - self.start) * self.fps)
+        if tick < self.tick:
+            return
+        self.tick = tick + 1
+
+        frame = tuple((handle, self.sprites[handle], lane, int(round(x)))
+                      for handle, lane, x in positions)
+        try:
+            self.queue.put_nowait((tick, frame))
+            self.captured += 1
+        except queue.Full:
+            # The frame before this one lasts longer instead
+            self.dropped += 1
+
+    def rectangles(self, sprites):
+        """
+        Where each image of a frame is drawn, centered on its position
+        like a canvas image and clipped to the canvas
+        :param sprites: (iterable) (handle, name, lane, x) of each image
+        :return: (list) (name, left, top, x0, y0, x1, y1) of each image
+                 on the canvas
+        """
+        found = []
+        for handle, name, lane, x in sprites:
+            width, height, rows = self.bitmaps[name]
+            left = x - width // 2
+            top = LANES[lane] - height // 2
+            x0, y0 = max(left, 0), max(top, 0)
+            x1 = min(left + width, self.width)
+            y1 = min(top + height, self.height)
+            if x0 < x1 and y0 < y1:
+                found.append((name, left, top, x0, y0, x1, y1))
+        return found
+
+    def draw(self, frame, background, rectangles, area):
+        """
+        Draw the images of a frame over the background, inside an area
+        :param frame: (bytearray) the frame, changed in place
+        :param background: (bytes) the empty frame
+        :param rectangles: (list) from rectangles
+        :param area: (tuple) x0, y0, x1, y1 of the area to draw
+        :return:
+        """
+        ax0, ay0, ax1, ay1 = area
+        stride = self.width * 3
+        for y in range(ay0, ay1):
+            start = y * stride + ax0 * 3
+            end = y * stride + ax1 * 3
+            frame[start:end] = background[start:end]
+        for name, left, top, x0, y0, x1, y1 in rectangles:
+            rows = self.bitmaps[name][2]
+            # clip the image to the area as well as the canvas
+            x0, x1 = max(x0, ax0), min(x1, ax1)
+            for y in range(max(y0, ay0), min(y1, ay1)):
+                offset = y * stride
+                for first, end, pixels in rows[y - top]:
+                    start = max(first + left, x0)
+                    stop = min(end + left, x1)
+                    if start < stop:
+                        skip = (start - left - first) * 3
+                        frame[offset + start * 3:offset + stop * 3] = \
+                            pixels[skip:skip + (stop - start) * 3]
+
+    def encode(self, frame, area):
+        """
+        Compress an area of the frame as PNG image data
+        :param frame: (bytearray) the frame
+        :param area: (tuple) x0, y0, x1, y1 of the area
+        :return: (bytes) the zlib stream of its rows
+        """
+        x0, y0, x1, y1 = area
+        stride = self.width * 3
+        # Filter type 0 (none) in front of every row
+        rows = b''.join(b'\x00' + frame[y * stride + x0 * 3:
+                                        y * stride + x1 * 3]
+                        for y in range(y0, y1))
+        return zlib.compress(rows, 6)
+
+    def work(self, frames):
+        """
+        Draw, encode and write the frames until the exporter is closed,
+        runs in the worker thread
+        :param frames: (queue.Queue) the frames
+        :return:
+        """
+        full = (0, 0, self.width, self.height)
+        background = bytes([255]) * (self.width * self.height * 3)
+        frame = bytearray(background)
+        output = self.output
+        shown = None
+        last_tick = 0
+        while True:
+            item = frames.get()
+            if item is None:
+                break
+            tick, sprites = item
+            last_tick = tick
+            if sprites == shown:
+                continue
+            # Only the images that were added, removed or moved since
+            # the last frame are drawn again
+            # the same handle at two places is drawn over where it was
+            # and where it is
+            changed = self.rectangles(set(sprites).symmetric_difference(
+                shown or ()))
+            if shown is None:
+                area = full
+            elif changed:
+                area = (min(rectangle[3] for rectangle in changed),
+                        min(rectangle[4] for rectangle in changed),
+                        max(rectangle[5] for rectangle in changed),
+                        max(rectangle[6] for rectangle in changed))
+            else:
+                # Moved outside the canvas, nothing to see changed
+                shown = sprites
+                continue
+            self.draw(frame, background, self.rectangles(sprites), area)
+            output.add(tick, frame, area, self.encode)
+            self.written += 1
+            shown = sprites
+        output.close(last_tick + 1)
+
+    def close(self):
+        """
+        Write the frames still queued and finish the file
+        :return:
+        """
+        if self.queue is not None:
+            self.queue.put(None)
+            self.queue = None
+            self.worker.join()
+
+
+class AnimatedPNG:
+
+    """
+    Writes frames to an animated PNG, each frame stored as the area
+    that changed. A frame is written once the next one arrives, when
+    how long it lasts is known
+
+    Argument:
+    path (String): the file
+    width (int): the width of the frames
+    height (int): the height of the frames
+    fps (int): the frames per second the ticks count
+
+    Attributes:
+        file (file object): the file
+        width (int): the width of the frames
+        height (int): the height of the frames
+        fps (int): the frames per second the ticks count
+        control (int): where the acTL chunk is, rewritten at close
+        sequence (int): the sequence number of the next fcTL or fdAT
+        frames (int): how many frames were written
+        pending (tuple): tick, area and data of the frame not written
+                         yet, None before the first frame
+        corner (bytes): the top left pixel of the last frame
+    """
+
+    def __init__(self, path, width, height, fps):
+        self.file = open(path, 'wb')
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.sequence = 0
+        self.frames = 0
+        self.file.write(PNG_SIGNATURE + header(width, height))
+        self.control = self.file.tell()
+        self.file.write(self.animation_control())
+        self.pending = None
+        self.corner = None
+
+    def animation_control(self):
+        # the number of frames and 0 for playing forever
+        return chunk(b'acTL', struct.pack('>II', self.frames, 0))
+
+    def add(self, tick, frame, area, encode):
+        """
+        Keep a frame to write when the next one arrives
+        :param tick: (int) the frame number it was captured at
+        :param frame: (bytearray) the whole frame
+        :param area: (tuple) x0, y0, x1, y1 of what changed
+        :param encode: (function) compresses an area of the frame
+        :return:
+        """
+        if self.pending is not None:
+            self.flush(tick)
+        self.pending = (tick, area, encode(frame, area))
+        self.corner = bytes(frame[:3])
+
+    def flush(self, end):
+        """
+        Write the pending frame, lasting until a frame number. A frame
+        can only last MAX_DELAY, a longer one is followed by frames
+        repeating its top left pixel
+        :param end: (int) the frame number the next frame starts at
+        :return:
+        """
+        start = self.pending[0]
+        while end - start > MAX_DELAY:
+            self.write(MAX_DELAY)
+            start += MAX_DELAY
+            self.pending = (start, (0, 0, 1, 1),
+                            zlib.compress(b'\x00' + self.corner))
+        self.write(max(1, end - start))
+
+    def write(self, delay):
+        """
+        Write the pending frame
+        :param delay: (int) how many frames it lasts
+        :return:
+        """
+        tick, (x0, y0, x1, y1), data = self.pending
+        self.file.write(chunk(b'fcTL', struct.pack(
+            '>IIIIIHHBB', self.sequence, x1 - x0, y1 - y0, x0, y0,
+            delay, self.fps, 0, 0)))
+        self.sequence += 1
+        if self.frames == 0:
+            # the first frame is also the image shown by plain viewers
+            self.file.write(chunk(b'IDAT', data))
+        else:
+            self.file.write(chunk(b'fdAT', struct.pack('>I', self.sequence)
+                                  + data))
+            self.sequence += 1
+        self.frames += 1
+        self.pending = None
+
+    def close(self, end):
+        """
+        Write the last frame and the number of frames
+        :param end: (int) the frame number the recording stopped at
+        :return:
+        """
+        if self.pending is not None:
+            self.flush(end)
+        self.file.write(chunk(b'IEND', b''))
+        self.file.seek(self.control)
+        self.file.write(self.animation_control())
+        self.file.close()
+
+
+class PNGSequence:
+
+    """
+    Writes every frame as a full PNG in a directory, with frames.txt
+    listing each file and how many ms it is shown
+
+    Argument:
+    path (String): the directory
+    width (int): the width of the frames
+    height (int): the height of the frames
+    fps (int): the frames per second the ticks count
+
+    Attributes:
+        path (String): the directory
+        index (file object): frames.txt
+        head (bytes): the signature and IHDR of every file
+        full (tuple): the area of a whole frame
+        fps (int): the frames per second the ticks count
+        frames (int): how many frames were written
+        pending (tuple): tick and file name of the frame whose duration
+                         is not known yet
+    """
+
+    def __init__(self, path, width, height, fps):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.index = open(os.path.join(path, 'frames.txt'), 'w')
+        self.head = PNG_SIGNATURE + header(width, height)
+        self.full = (0, 0, width, height)
+        self.fps = fps
+        self.frames = 0
+        self.pending = None
+
+    def add(self, tick, frame, area, encode):
+        """
+        Write a frame, and the duration of the one before it
+        :param tick: (int) the frame number it was captured at
+        :param frame: (bytearray) the whole frame
+        :param area: (tuple) x0, y0, x1, y1 of what changed, unused as
+                     every file holds a whole frame
+        :param encode: (function) compresses an area of the frame
+        :return:
+        """
+        self.finish(tick)
+        name = f'frame{self.frames:06d}.png'
+        with open(os.path.join(self.path, name), 'wb') as file:
+            file.write(self.head + chunk(b'IDAT', encode(frame, self.full))
+                       + chunk(b'IEND', b''))
+        self.frames += 1
+        self.pending = (tick, name)
+
+    def finish(self, end):
+        """
+        List the pending frame with how long it is shown
+        :param end: (int) the frame number the next frame starts at
+        :return:
+        """
+        if self.pending is not None:
+            tick, name = self.pending
+            milliseconds = max(1, end - tick) * 1000 // self.fps
+            self.index.write(f'{name} {milliseconds}\n')
+            self.pending = None
+
+    def close(self, end):
+        """
+        List the last frame and close frames.txt
+        :param end: (int) the frame number the recording stopped at
+        :return:
+        """
+        self.finish(end)
+        self.index.close()
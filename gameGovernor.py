@@ -0,0 +1,145 @@
+# ----------------------------------------------------------------------
+# Name:        The counting game load governor
+# Author:       Counting Game contributors
+# Purpose:     keep frames within their budget when rounds get huge
+#
+# Date:       Fall 2026
+# ----------------------------------------------------------------------
+"""
+Load governor of the endless mode of the counting game
+
+Every round has more images than the one before, so in endless mode a
+round eventually has more images on screen than a frame can move and
+draw in time. The governor measures what each frame really costs and
+when the cost stays over the frame budget it slows the round down:
+
+    rate          how fast the round plan runs, 1 is the normal speed.
+                  Below 1 the copies of each image come further apart
+    min_gap       the least ms of round time between two images
+                  appearing, spreads out images due at the same time
+    max_sprites   the most images on screen at once, no image appears
+                  while there are that many
+
+While it holds an image back the plan stops, so nothing is skipped:
+every copy of the round still appears, only later, and the answer of
+the round is the same. When frames are well within the budget again it
+gives the speed back step by step.
+
+Every change is returned with the reason for it, for telemetry.
+"""
+
+# Frames the cost is averaged over before the governor acts again
+WINDOW = 25
+# How far over the budget the cost may be before images are capped
+CAP_FACTOR = 1.5
+# Below this fraction of the budget the governor gives speed back
+RELAX_FACTOR = 0.6
+# Limits of each setting
+MIN_RATE = 0.1
+MAX_GAP = 1000
+MIN_SPRITES = 8
+
+
+class LoadGovernor:
+
+    """
+    Adapts how fast images appear to what the frames cost
+
+    Argument:
+    budget (float): the ms a frame may take
+    step_ms (int): the ms of round time of one simulation step
+
+    Attributes:
+        budget (float): the ms a frame may take
+        step_ms (int): the ms of round time of one simulation step
+        cost (float): the average ms of the recent frames, None before
+                      the first frame
+        frames (int): the frames measured since the governor last acted
+        rate (float): how fast the round plan runs, from MIN_RATE to 1
+        min_gap (float): the least ms between two images appearing
+        max_sprites (int): the most images on screen, None for no limit
+        next_spawn (float): the round time the next image may appear
+        throttles (int): how many times the governor slowed the round
+    """
+
+    def __init__(self, budget, step_ms):
+        self.budget = budget
+        self.step_ms = step_ms
+        self.cost = None
+        self.frames = 0
+        self.rate = 1.0
+        self.min_gap = 0
+        self.max_sprites = None
+        self.next_spawn = 0
+        self.throttles = 0
+
+    def hold(self, sprites, round_time):
+        """
+        Whether images must wait before appearing
+        :param sprites: (int) the images on screen
+        :param round_time: (float) the ms since the round started
+        :return: (boolean) True to hold the plan
+        """
+        return round_time < self.next_spawn or \
+            (self.max_sprites is not None and sprites >= self.max_sprites)
+
+    def spawned(self, round_time):
+        """
+        An image appeared, the next one waits min_gap
+        :param round_time: (float) the ms since the round started
+        :return:
+        """
+        self.next_spawn = round_time + self.min_gap
+
+    def new_round(self):
+        self.next_spawn = 0
+
+    def measure(self, cost, sprites):
+        """
+        Take the cost of one frame, and every WINDOW frames slow the
+        round down or speed it up
+        :param cost: (float) the ms the frame took
+        :param sprites: (int) the images on screen
+        :return: (dict) the change and its reason, None when nothing
+                 changed
+        """
+        if self.cost is None:
+            self.cost = cost
+        else:
+            # moving average, one slow frame does not throttle
+            self.cost += (cost - self.cost) * 2 / (WINDOW + 1)
+        self.frames += 1
+        if self.frames < WINDOW:
+            return None
+        self.frames = 0
+
+        before = (self.rate, self.min_gap, self.max_sprites)
+        if self.cost > self.budget:
+            reason = 'over_budget'
+            self.rate = max(MIN_RATE, self.rate * 0.8)
+            self.min_gap = min(MAX_GAP, self.min_gap + self.step_ms)
+            if self.cost > self.budget * CAP_FACTOR:
+                # Far over, stop adding to what is on screen now
+                cap = max(MIN_SPRITES, int(sprites * 0.9))
+                if self.max_sprites is None or cap < self.max_sprites:
+                    self.max_sprites = cap
+        elif self.cost < self.budget * RELAX_FACTOR and \
+                (self.rate < 1 or self.min_gap or self.max_sprites):
+            reason = 'under_budget'
+            self.rate = min(1.0, self.rate + 0.05)
+            self.min_gap = max(0, self.min_gap - self.step_ms)
+            if self.max_sprites is not None:
+                self.max_sprites += max(1, self.max_sprites // 10)
+                if self.rate == 1 and not self.min_gap:
+                    self.max_sprites = None
+        else:
+            return None
+        if (self.rate, self.min_gap, self.max_sprites) == before:
+            # already as slow as it goes
+            return None
+        if reason == 'over_budget':
+            self.throttles += 1
+        return {'reason': reason, 'frame_ms': round(self.cost, 2),
+                'budget_ms': self.budget, 'sprites': sprites,
+                'rate': round(self.rate, 3), 'min_gap_ms': self.min_gap,
+                'max_sprites': self.max_sprites}
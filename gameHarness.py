@@ -0,0 +1,164 @@
+# ----------------------------------------------------------------------
+# Name:        The counting game harness
+# Author:       Counting Game contributors
+# Purpose:     run a counting game without a player or a display
+#
+# Date:       Fall 2026
+# ----------------------------------------------------------------------
+"""
+Run a CountingGame without a player, for the tools and the tests that
+play the game from code
+
+HeadlessGame builds the game on the in-memory tkinter of fakeTkinter,
+or on the real tkinter, and moves it on with a fake clock. Frames run
+through the frame loop of the game itself, the after callback of its
+TickDriver, from the welcome screen on, so the frames and every other
+after callback run in the order the event loop would run them:
+
+    game = HeadlessGame(['easy'])
+    game.start()
+    game.game.game_logic()
+    game.wait(5)
+    game.close()
+
+An error raised by a frame callback is printed the way tkinter prints
+it and kept in errors, so a caller can fail on it.
+"""
+
+import contextlib
+import io
+import time
+import traceback
+import unittest.mock
+
+import countingGame
+import fakeTkinter
+
+
+class HeadlessGame:
+
+    """
+    A counting game played by code instead of a player
+
+    Argument:
+    argv (list): the command line arguments of the game
+    tk: the tkinter module to draw with, fakeTkinter or tkinter
+    fake_clock (boolean): False to let a game on the real tkinter run
+                          in real time
+
+    Attributes:
+        tk: the tkinter module the game draws with
+        real (boolean): True on the real tkinter
+        fake_clock (boolean): True when the game follows now instead
+                              of the wall clock
+        now (float): the fake clock in ms
+        errors (list): every exception raised by a callback
+        root (tkinter.Tk): the root window
+        game (CountingGame): the game being played
+    """
+
+    def __init__(self, argv, tk=fakeTkinter, fake_clock=True):
+        self.tk = tk
+        self.real = tk is not fakeTkinter
+        self.fake_clock = fake_clock or not self.real
+        self.now = 0.0
+        self.errors = []
+        # countingGame draws with whatever module it calls tkinter
+        self.patch = unittest.mock.patch.object(countingGame, 'tkinter',
+                                                tk)
+        self.patch.start()
+        self.root = tk.Tk()
+        self.root.report_callback_exception = self.report
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.game = countingGame.CountingGame(self.root, argv=argv)
+        except BaseException:
+            # Bad arguments exit before there is a game to close
+            self.patch.stop()
+            raise
+        if self.fake_clock:
+            self.game.driver.clock = self.clock
+            self.game.last_frame = self.clock()
+            if self.game.recorder is not None:
+                self.game.recorder.clock = self.clock
+                self.game.recorder.start = self.clock()
+
+    def clock(self):
+        """
+        The fake clock, in place of the clock of the frame loop
+        :return: (float) the time in seconds
+        """
+        return self.now / 1000
+
+    def report(self, exc, value, trace):
+        """
+        Print an error raised by a callback and keep it
+        :param exc: the exception class
+        :param value: the exception
+        :param trace: the traceback
+        :return:
+        """
+        self.errors.append(value)
+        traceback.print_exception(exc, value, trace)
+
+    def frame(self, now=None):
+        """
+        Move the fake clock on and run the callbacks that are due, the
+        next frame among them
+        :param now: (float) the time in ms to move the clock to, one
+                    frame later when None
+        :return:
+        """
+        if now is None:
+            now = self.now + self.game.driver.interval
+        self.now = now
+        if self.real:
+            # Run the frame now instead of when its after comes due
+            self.game.driver.stop()
+            self.game.driver.tick()
+            self.root.update()
+        else:
+            self.root.run_due(self.now)
+
+    def wait(self, seconds):
+        """
+        Let the game run, frames and every other after callback
+        :param seconds: (float) for how long
+        :return:
+        """
+        if not self.fake_clock:
+            end = time.perf_counter() + seconds
+            while time.perf_counter() < end:
+                self.root.update()
+                time.sleep(0.005)
+            return
+        self.run_until(self.now + seconds * 1000)
+
+    def run_until(self, end):
+        """
+        Run frame after frame until the fake clock reaches end
+        :param end: (float) the time in ms to stop at
+        :return:
+        """
+        while self.now < end:
+            self.frame(min(self.now + self.game.driver.interval, end))
+
+    def start(self, welcome=1):
+        """
+        Stay on the welcome screen for a while then press start
+        :param welcome: (float) the seconds spent on the welcome screen
+        :return:
+        """
+        self.wait(welcome)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.game.start_game()
+
+    def close(self):
+        """
+        Close the game and its window
+        :return:
+        """
+        self.game.close()
+        if self.real:
+            self.root.destroy()
+        self.patch.stop()
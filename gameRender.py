@@ -0,0 +1,332 @@
+# ----------------------------------------------------------------------
+# Name:        The counting game renderers
+# Author:       Counting Game contributors
+# Purpose:     draw the moving images on the game canvas
+#
+# Date:       Fall 2026
+# ----------------------------------------------------------------------
+"""
+Ways of drawing the moving images of the counting game
+
+CountingGame keeps where every image is and hands the positions to a
+backend once per frame. Both backends have the same methods:
+
+    add(obj, lane, x)   start drawing an image, returns its handle
+    remove(handle)      stop drawing an image
+    draw(positions)     draw every (handle, lane, x) for this frame
+    stats()             counters to report with the frame statistics
+
+CanvasBackend gives every image its own canvas item, taken from a
+SpritePool. BufferBackend draws every image into one NumPy pixel
+buffer and shows it as a single PhotoImage, so a frame costs the same
+whatever the number of images; it needs NumPy.
+"""
+
+import collections
+import tkinter
+
+from gameAssets import read_pixels
+from gameEngine import START_X, LANES, WIDTH, HEIGHT
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class SpritePool:
+
+    """
+    Canvas image items that are hidden and reused instead of deleted
+
+    Argument:
+    canvas (tkinter.Canvas): the canvas the items live on
+    capacity (int): how many items to create up front
+
+    Attributes:
+        canvas (tkinter.Canvas): the canvas the items live on
+        free (list): the image_ids of hidden items ready to be reused
+        size (int): how many items the pool has created in total
+        hits (int): how many times acquire reused a hidden item
+        misses (int): how many times acquire found no hidden item
+        growth (int): how many items were created after the pool ran
+                      out of hidden items
+    """
+
+    def __init__(self, canvas, capacity=16):
+        self.canvas = canvas
+        self.free = []
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.growth = 0
+        self.grow(capacity)
+
+    def grow(self, amount):
+        """
+        Create hidden items waiting at the start of the canvas
+        :param amount: (int) how many items to create
+        :return:
+        """
+        for item in range(amount):
+            image_id = self.canvas.create_image(START_X, LANES[0],
+                                                state='hidden')
+            self.free.append(image_id)
+        self.size += amount
+
+    def acquire(self, obj, x, y, tags=()):
+        """
+        Show an image at (x, y), reusing a hidden item when there is one
+        When the pool is empty it doubles in size
+        :param obj: (image object) the image that will be drawn on canvas
+        :param x: (int) the x coordinate to show the image at
+        :param y: (int) the y coordinate to show the image at
+        :param tags: (tuple) the canvas tags to give the item
+        :return: the image_id of the item showing the image
+        """
+        if self.free:
+            self.hits += 1
+        else:
+            self.misses += 1
+            self.growth += self.size
+            self.grow(self.size)
+        image_id = self.free.pop()
+        self.canvas.coords(image_id, x, y)
+        self.canvas.itemconfig(image_id, image=obj, state='normal', tags=tags)
+        return image_id
+
+    def release(self, image_id):
+        """
+        Hide an item and move it back to the start so it can be reused
+        Its tags are removed so tagged moves leave it alone
+        :param image_id: the image_id of the item
+        :return:
+        """
+        self.canvas.itemconfig(image_id, state='hidden', tags=())
+        self.canvas.coords(image_id, START_X, LANES[0])
+        self.free.append(image_id)
+
+    def stats(self):
+        """
+        Counters of how well the pool is reusing items
+        :return: (dict) size, in use, hits, misses and growth
+        """
+        return {'size': self.size, 'in_use': self.size - len(self.free),
+                'hits': self.hits, 'misses': self.misses,
+                'growth': self.growth}
+
+
+class CanvasBackend:
+
+    """
+    Draw each image as its own canvas item
+
+    Images are tagged by lane and speed, so images of one lane moving
+    together are moved with one tagged move per frame, and only the
+    images that moved differently (one that was just added) are placed
+    one by one
+
+    Argument:
+    canvas (tkinter.Canvas): the canvas to draw on
+    speed (int): the speed class of the images
+
+    Attributes:
+        canvas (tkinter.Canvas): the canvas to draw on
+        speed (int): the speed class of the images
+        pool (SpritePool): the reusable image items of canvas
+        drawn_x (dict): the x coordinate each image is drawn at
+    """
+
+    def __init__(self, canvas, speed):
+        self.canvas = canvas
+        self.speed = speed
+        self.pool = SpritePool(canvas)
+        self.drawn_x = {}
+
+    def add(self, obj, lane, x):
+        """
+        Start drawing an image
+        :param obj: (image object) the image to draw
+        :param lane: (int) the lane number of the image
+        :param x: (float) the x coordinate to draw it at
+        :return: the image_id of the canvas item, its handle
+        """
+        image_id = self.pool.acquire(obj, x, LANES[lane],
+                                     (f'lane{lane}', f'speed{self.speed}'))
+        self.drawn_x[image_id] = x
+        return image_id
+
+    def remove(self, image_id):
+        """
+        Stop drawing an image and give its item back to the pool
+        :param image_id: the handle returned by add
+        :return:
+        """
+        del self.drawn_x[image_id]
+        self.pool.release(image_id)
+
+    def draw(self, positions):
+        """
+        Draw every image at its position for this frame
+        :param positions: (list) (handle, lane, x) of every image
+        :return:
+        """
+        groups = {}
+        for image_id, lane, x in positions:
+            groups.setdefault(lane, []).append((image_id, x))
+
+        for lane, members in groups.items():
+            # the shift most images of the group need this frame
+            shifts = collections.Counter(
+                round(target - self.drawn_x[image_id], 6)
+                for image_id, target in members)
+            shift = shifts.most_common(1)[0][0]
+            if shift:
+                self.canvas.move(f'lane{lane}&&speed{self.speed}', shift, 0)
+            for image_id, target in members:
+                if round(target - self.drawn_x[image_id], 6) == shift:
+                    self.drawn_x[image_id] += shift
+                else:
+                    self.canvas.coords(image_id, target, LANES[lane])
+                    self.drawn_x[image_id] = target
+
+    def stats(self):
+        """
+        Counters of the sprite pool
+        :return: (dict)
+        """
+        return {f'pool_{name}': value
+                for name, value in self.pool.stats().items()}
+
+
+class BufferBackend:
+
+    """
+    Draw every image into one pixel buffer shown as a single image
+
+    Each frame the buffer is cleared to the canvas background, every
+    image is copied in through its transparency mask and the whole
+    buffer is handed to one PhotoImage in a single PPM update
+
+    Argument:
+    canvas (tkinter.Canvas): the canvas to draw on
+    photo_class (class): makes the PhotoImage, defaults to
+                         tkinter.PhotoImage
+    width (int): the width of the canvas
+    height (int): the height of the canvas
+    pixels (function): gives the pixels of an image, defaults to
+                       gameAssets.read_pixels
+
+    Attributes:
+        canvas (tkinter.Canvas): the canvas to draw on
+        pixels (function): gives the pixels of an image
+        photo (tkinter.PhotoImage): shows the buffer
+        item (int): the canvas item showing photo
+        background (numpy.ndarray): the empty frame, height x width x 3
+        frame (numpy.ndarray): the buffer the images are drawn into
+        bitmaps (dict): (RGBA pixels, opaque mask) of every image drawn
+                        so far, by image name
+        sprites (dict): the image name of each handle
+        next_handle (int): the handle the next image gets
+        dirty (boolean): the shown frame has images to erase
+        pushes (int): how many frames were handed to photo
+    """
+
+    def __init__(self, canvas, photo_class=None, width=WIDTH, height=HEIGHT,
+                 pixels=read_pixels):
+        if numpy is None:
+            raise RuntimeError('the buffer backend needs NumPy installed')
+        if photo_class is None:
+            photo_class = tkinter.PhotoImage
+        self.canvas = canvas
+        self.pixels = pixels
+        self.photo = photo_class(master=canvas, width=width, height=height)
+        self.item = canvas.create_image(0, 0, anchor='nw', image=self.photo)
+        self.background = numpy.full((height, width, 3), 255, numpy.uint8)
+        self.frame = self.background.copy()
+        self.header = f'P6 {width} {height} 255\n'.encode()
+        self.bitmaps = {}
+        self.sprites = {}
+        self.next_handle = 0
+        self.dirty = False
+        self.pushes = 0
+
+    def bitmap(self, obj):
+        """
+        The pixels of an image as arrays, made the first time
+        :param obj: (tkinter.PhotoImage) the image
+        :return: tuple of the RGBA pixels (h x w x 4) and the opaque
+                 mask (h x w)
+        """
+        name = str(obj)
+        if name not in self.bitmaps:
+            width, height, rows = self.pixels(obj)
+            data = b''.join(b'\0\0\0\0' if color is None
+                            else color + b'\xff'
+                            for row in rows for color in row)
+            pixels = numpy.frombuffer(data, numpy.uint8).reshape(
+                height, width, 4)
+            self.bitmaps[name] = (pixels, pixels[:, :, 3] > 0)
+        return self.bitmaps[name]
+
+    def add(self, obj, lane, x):
+        """
+        Start drawing an image
+        :param obj: (tkinter.PhotoImage) the image to draw
+        :param lane: (int) the lane number of the image
+        :param x: (float) the x coordinate to draw it at
+        :return: (int) the handle of the image
+        """
+        handle = self.next_handle
+        self.next_handle += 1
+        self.bitmap(obj)
+        self.sprites[handle] = str(obj)
+        return handle
+
+    def remove(self, handle):
+        """
+        Stop drawing an image
+        :param handle: the handle returned by add
+        :return:
+        """
+        del self.sprites[handle]
+
+    def draw(self, positions):
+        """
+        Draw every image into the buffer, centered on its position like
+        a canvas image, and show the buffer
+        :param positions: (list) (handle, lane, x) of every image
+        :return:
+        """
+        if not positions and not self.dirty:
+            return
+        frame = self.frame
+        frame[:] = self.background
+        frame_height, frame_width = frame.shape[:2]
+        for handle, lane, x in positions:
+            pixels, mask = self.bitmaps[self.sprites[handle]]
+            height, width = mask.shape
+            left = int(round(x)) - width // 2
+            top = LANES[lane] - height // 2
+            # clip the image to the buffer
+            x0, y0 = max(left, 0), max(top, 0)
+            x1 = min(left + width, frame_width)
+            y1 = min(top + height, frame_height)
+            if x0 >= x1 or y0 >= y1:
+                continue
+            region = frame[y0:y1, x0:x1]
+            sprite_mask = mask[y0 - top:y1 - top, x0 - left:x1 - left]
+            region[sprite_mask] = pixels[y0 - top:y1 - top,
+                                         x0 - left:x1 - left, :3][sprite_mask]
+        self.photo.configure(data=self.header + frame.tobytes(),
+                             format='PPM')
+        self.pushes += 1
+        self.dirty = bool(positions)
+
+    def stats(self):
+        """
+        Counters of the buffer
+        :return: (dict)
+        """
+        return {'buffer_sprites': len(self.sprites),
+                'buffer_pushes': self.pushes}
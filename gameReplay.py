@@ -0,0 +1,253 @@
+# ----------------------------------------------------------------------
+# Name:        The counting game replay
+# Author:       Counting Game contributors
+# Purpose:     record a session to a binary file and play it back
+#
+# Date:       Fall 2026
+# ----------------------------------------------------------------------
+"""
+Record a counting game session and play it back without a display
+
+A replay file is append-only. Each session starts with a header
+(difficulty, seed and frame rate) and is followed by one small record
+per event:
+
+    R  a round starts               round number
+    S  an image appears             round time, image index, lane
+    A  an answer is scored          answer, score and lives after it
+    Z  the game is reset
+    G  the game ends                final score
+
+Every record is its type letter, the ms since the session started and
+the fields above, packed with struct.
+
+Playing back runs CountingGame on the in-memory canvas of fakeTkinter,
+as fast as possible, presses the same buttons at the same times and
+checks that the same images appear and the same scores come out:
+
+    python gameReplay.py session.replay
+"""
+
+import argparse
+import contextlib
+import io
+import struct
+import sys
+
+MAGIC = b'CGRP'
+VERSION = 1
+DIFFICULTY_CODES = ('easy', 'medium', 'hard')
+
+# magic, version, difficulty, seed, frame rate
+HEADER = struct.Struct('<4sBBQH')
+# type letter, ms since the session started
+EVENT = struct.Struct('<cI')
+# the fields that follow each type of event
+FIELDS = {
+    b'R': struct.Struct('<I'),
+    b'S': struct.Struct('<IBB'),
+    b'A': struct.Struct('<iIB'),
+    b'Z': struct.Struct('<'),
+    b'G': struct.Struct('<I'),
+}
+# The seeds and answers the fields above can hold
+SEED_RANGE = range(2 ** 64)
+ANSWER_RANGE = range(-2 ** 31, 2 ** 31)
+
+
+class ReplayRecorder:
+
+    """
+    Stream the events of one session to the end of a replay file
+
+    Argument:
+    path (String): the replay file, created if needed
+    difficulty (String): the difficulty mode
+    seed (int): the session seed
+    fps (int): the frame rate of the game
+    clock (function): returns the current time in seconds
+
+    Attributes:
+        file (file object): the replay file open for appending
+        clock (function): returns the current time in seconds
+        start (float): the clock time the session started
+    """
+
+    def __init__(self, path, difficulty, seed, fps, clock):
+        self.file = open(path, 'ab')
+        self.clock = clock
+        self.start = clock()
+        self.file.write(HEADER.pack(MAGIC, VERSION,
+                                    DIFFICULTY_CODES.index(difficulty),
+                                    seed, fps))
+
+    def write(self, kind, *fields):
+        """
+        Append one event to the file
+        :param kind: (bytes) the type letter of the event
+        :param fields: the fields of the event
+        :return:
+        """
+        elapsed = int((self.clock() - self.start) * 1000)
+        self.file.write(EVENT.pack(kind, elapsed) + FIELDS[kind].pack(*fields))
+
+    def round_start(self, round_number):
+        self.write(b'R', round_number)
+
+    def spawn(self, round_time, image, lane):
+        self.write(b'S', int(round_time), image, lane)
+
+    def answer(self, answer, score, lives):
+        self.write(b'A', answer, score, lives)
+        self.file.flush()
+
+    def reset(self):
+        self.write(b'Z')
+        self.file.flush()
+
+    def end(self, score):
+        self.write(b'G', score)
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+def read_sessions(path):
+    """
+    Read every session stored in a replay file
+    :param path: (String) the replay file
+    :return: (list) tuple of the difficulty, seed, frame rate and the
+             list of (type letter, ms, fields) events of each session
+    """
+    with open(path, 'rb') as replay:
+        data = replay.read()
+    sessions = []
+    offset = 0
+    while offset < len(data):
+        if data[offset:offset + 4] == MAGIC:
+            magic, version, difficulty, seed, fps = \
+                HEADER.unpack_from(data, offset)
+            if version != VERSION:
+                raise ValueError(f'unknown replay version {version}')
+            offset += HEADER.size
+            events = []
+            sessions.append((DIFFICULTY_CODES[difficulty], seed, fps,
+                             events))
+            continue
+        if not sessions or offset + EVENT.size > len(data):
+            raise ValueError(f'damaged replay file at byte {offset}')
+        kind, elapsed = EVENT.unpack_from(data, offset)
+        offset += EVENT.size
+        fields = FIELDS[kind].unpack_from(data, offset)
+        offset += FIELDS[kind].size
+        sessions[-1][3].append((kind, elapsed, fields))
+    return sessions
+
+
+class MemoryRecorder:
+
+    """
+    Keeps the events of a played back session in a list instead of
+    writing them to a file, with the same methods as ReplayRecorder
+
+    Attributes:
+        events (list): (type letter, fields) of every event
+    """
+
+    def __init__(self):
+        self.events = []
+
+    def round_start(self, round_number):
+        self.events.append((b'R', (round_number,)))
+
+    def spawn(self, round_time, image, lane):
+        self.events.append((b'S', (int(round_time), image, lane)))
+
+    def answer(self, answer, score, lives):
+        self.events.append((b'A', (answer, score, lives)))
+
+    def reset(self):
+        self.events.append((b'Z', ()))
+
+    def end(self, score):
+        self.events.append((b'G', (score,)))
+
+    def close(self):
+        pass
+
+
+def play_back(difficulty, seed, fps, events):
+    """
+    Play a recorded session again on the in-memory canvas, as fast as
+    possible, and compare what happens with what was recorded
+    :param difficulty: (String) the difficulty mode
+    :param seed: (int) the session seed
+    :param fps: (int) the frame rate of the game
+    :param events: (list) the recorded (type letter, ms, fields)
+    :return: (list) a description of every difference, empty when the
+             session played back the same
+    """
+    # Imported here because countingGame imports this module
+    from gameHarness import HeadlessGame
+
+    recorder = MemoryRecorder()
+    harness = HeadlessGame([difficulty, f'--seed={seed}', f'--fps={fps}'])
+    game = harness.game
+    game.recorder = recorder
+    # Start is not recorded, the player pressed it on the welcome screen
+    # some time before the first event
+    harness.start(events[0][1] / 1000 if events else 0)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for kind, elapsed, fields in events:
+            # Run the frames up to the time of the event
+            harness.run_until(elapsed)
+            # Press the same buttons the player pressed
+            if kind == b'R':
+                game.game_logic()
+            elif kind == b'A':
+                game.user_input.set(str(fields[0]))
+                game.get_user_answer()
+            elif kind == b'Z':
+                game.reset_func()
+            elif kind == b'G' and not game.engine.game_over:
+                # Running out of lives has already ended the game
+                game.end_game()
+    harness.close()
+
+    recorded = [(kind, fields) for kind, elapsed, fields in events]
+    differences = []
+    for index, (expected, actual) in enumerate(zip(recorded,
+                                                   recorder.events)):
+        if expected != actual:
+            differences.append(f'event {index}: recorded {expected} '
+                               f'played back {actual}')
+    if len(recorded) != len(recorder.events):
+        differences.append(f'recorded {len(recorded)} events, '
+                           f'played back {len(recorder.events)}')
+    for error in harness.errors:
+        differences.append(f'a frame failed: {error!r}')
+    return differences
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Play back recorded counting game sessions')
+    parser.add_argument('replay', help='the replay file to play back')
+    arguments = parser.parse_args()
+
+    failed = False
+    for number, (difficulty, seed, fps, events) in enumerate(
+            read_sessions(arguments.replay)):
+        differences = play_back(difficulty, seed, fps, events)
+        status = 'ok' if not differences else 'DIFFERENT'
+        print(f'session {number}: {difficulty}, seed {seed}, '
+              f'{len(events)} events: {status}')
+        for difference in differences:
+            print('   ', difference)
+        failed = failed or bool(differences)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+# ----------------------------------------------------------------------
+# Name:        The counting game scores
+# Author:       Counting Game contributors
+# Purpose:     keep every final score and show the best ones
+#
+# Date:       Fall 2026
+# ----------------------------------------------------------------------
+"""
+High score store of the counting game
+
+Every finished game is kept in a SQLite file with the player's name,
+the difficulty, the score and the rounds played. The game adds a score
+at the end screen without waiting: a writer thread takes the scores
+from a queue and inserts them in batches, one transaction per batch.
+
+The table has an index by difficulty and score and one by player,
+difficulty and score, so the best scores of a difficulty and the best
+score of a player are read from the front of an index however many
+games are stored. Scores still waiting for the writer are included.
+
+The leaderboard of a score file can be printed with:
+
+    python gameScores.py scores.db --difficulty medium --top 10
+"""
+
+import argparse
+import queue
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    player TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    rounds INTEGER NOT NULL,
+    played REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_top
+    ON games (difficulty, score DESC, id);
+CREATE INDEX IF NOT EXISTS games_player
+    ON games (player, difficulty, score DESC);
+"""
+
+# The most scores the writer inserts in one transaction
+BATCH_SIZE = 500
+
+
+class ScoreStore:
+
+    """
+    A SQLite file of every finished game, written from a thread
+
+    Argument:
+    path (String): the score file, created if needed
+
+    Attributes:
+        path (String): the score file
+        reader (sqlite3.Connection): the connection queries are made on
+        queue (queue.Queue): the scores waiting for the writer, None
+                             once the store is closed
+        pending (list): the scores taken by the writer or waiting for
+                        it, until they are committed
+        lock (threading.Lock): held while pending changes or is read,
+                               never while the file is written
+        writer (threading.Thread): inserts the scores
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.reader = sqlite3.connect(path)
+        # Readers do not wait for the writer and the writer does not
+        # wait for the disk on every commit
+        self.reader.execute('PRAGMA journal_mode=WAL')
+        self.reader.executescript(SCHEMA)
+        self.queue = queue.Queue()
+        self.pending = []
+        self.lock = threading.Lock()
+        self.writer = threading.Thread(target=self.write, daemon=True,
+                                       name='score-writer')
+        self.writer.start()
+
+    def add(self, player, difficulty, score, rounds):
+        """
+        Keep the score of a finished game, returns without waiting for
+        it to be written
+        :param player: (String) the player's name
+        :param difficulty: (String) the difficulty mode
+        :param score: (int) the final score
+        :param rounds: (int) how many rounds were played
+        :return:
+        """
+        game = (player, difficulty, score, rounds, time.time())
+        with self.lock:
+            self.pending.append(game)
+        self.queue.put(game)
+
+    def write(self):
+        """
+        Insert the queued scores until the store is closed, runs in the
+        writer thread
+        :return:
+        """
+        connection = sqlite3.connect(self.path)
+        connection.execute('PRAGMA synchronous=NORMAL')
+        closing = False
+        while not closing:
+            batch = [self.queue.get()]
+            # Take whatever else is already waiting, up to a batch
+            while len(batch) < BATCH_SIZE:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in batch:
+                closing = True
+                batch = [game for game in batch if game is not None]
+            # The lock is not held while writing, so add never waits
+            # on the disk. Until the batch leaves pending a query can
+            # find a score both in the file and in pending, top drops
+            # the copy in pending
+            with connection:
+                connection.executemany(
+                    'INSERT INTO games (player, difficulty, score, '
+                    'rounds, played) VALUES (?, ?, ?, ?, ?)', batch)
+            with self.lock:
+                del self.pending[:len(batch)]
+        connection.close()
+
+    def top(self, difficulty, count=5):
+        """
+        The best scores of a difficulty, the earliest first on a tie
+        :param difficulty: (String) the difficulty mode
+        :param count: (int) how many scores
+        :return: (list) (player, score) of each, best first
+        """
+        with self.lock:
+            waiting = [(player, score, rounds, played) for player, mode,
+                       score, rounds, played in self.pending
+                       if mode == difficulty]
+        stored = self.reader.execute(
+            'SELECT player, score, rounds, played FROM games '
+            'WHERE difficulty = ? ORDER BY score DESC, id LIMIT ?',
+            (difficulty, count)).fetchall()
+        # A game committed since pending was read is in both, the same
+        # name, score, rounds and time are the same game
+        waiting = [game for game in waiting if game not in stored]
+        # sorted keeps the order of equal scores, and the ones waiting
+        # were played after the ones in the file
+        games = sorted(stored + waiting, key=lambda game: -game[1])
+        return [(player, score) for player, score, rounds, played
+                in games[:count]]
+
+    def best(self, player, difficulty):
+        """
+        The best score of a player at a difficulty
+        :param player: (String) the player's name
+        :param difficulty: (String) the difficulty mode
+        :return: (int) the score, None if the player has no game
+        """
+        with self.lock:
+            waiting = [score for name, mode, score, rounds, played
+                       in self.pending
+                       if name == player and mode == difficulty]
+        # A game in both counts once in the maximum
+        row = self.reader.execute(
+            'SELECT MAX(score) FROM games '
+            'WHERE player = ? AND difficulty = ?',
+            (player, difficulty)).fetchone()
+        scores = waiting + ([row[0]] if row[0] is not None else [])
+        return max(scores) if scores else None
+
+    def close(self):
+        """
+        Write every score still waiting and close the file
+        :return:
+        """
+        if self.queue is not None:
+            self.queue.put(None)
+            self.writer.join()
+            self.reader.close()
+            self.queue = None
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Show the best counting game scores')
+    parser.add_argument('scores', help='the score file')
+    parser.add_argument('--difficulty', default='easy',
+                        choices=['easy', 'medium', 'hard'])
+    parser.add_argument('--top', type=int, default=10,
+                        help='How many scores to show')
+    parser.add_argument('--player', help='Also show the best of a player')
+    arguments = parser.parse_args()
+
+    store = ScoreStore(arguments.scores)
+    for place, (player, score) in enumerate(
+            store.top(arguments.difficulty, arguments.top), 1):
+        print(f'{place:>3}. {player:<20} {score}')
+    if arguments.player is not None:
+        print(f'best of {arguments.player}: '
+              f'{store.best(arguments.player, arguments.difficulty)}')
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+# ----------------------------------------------------------------------
+# Name:        The counting game server
+# Author:       Counting Game contributors
+# Purpose:     run many counting game sessions from one process
+#
+# Date:       Fall 2026
+# ----------------------------------------------------------------------
+"""
+Serve many counting game sessions from one asyncio process
+
+The server keeps a headless GameEngine per session and speaks JSON,
+one object per line, over a local TCP socket or stdin/stdout:
+
+    python gameServer.py --port 8765
+    python gameServer.py --stdio
+
+Every request has an op and an id that is copied into its reply:
+
+    new      difficulty, seed   start a session, reply has its number
+    round    session            start the next round, reply has the
+                                image to count, the counts and the
+                                wait, image and lane of every copy
+    answer   session, answer    score the answer of the round
+    reset    session            start the session again from round 1
+    close    session            forget the session
+    stats                       sessions held, CPU time and memory
+
+The rules are the ones of GameEngine, so a session plays exactly like
+the same seed in CountingGame. A session only keeps its engine and the
+answer of the round being played, the plan is dropped once it has been
+sent. Sessions are forgotten when their connection closes.
+
+RemoteEngine has the methods of GameEngine that CountingGame uses and
+plays through a server, so the game can be a thin client that only
+draws:
+
+    python countingGame.py medium --server localhost:8765
+"""
+
+import argparse
+import asyncio
+import collections
+import json
+import socket
+import sys
+import time
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from gameEngine import GameEngine, RoundPlan, RoundState, DIFFICULTIES
+
+
+def round_message(state):
+    """
+    The part of a round reply that describes the round
+    :param state: (RoundState) a round that has not started yet
+    :return: (dict)
+    """
+    plan = state.plan
+    plan.prepare()
+    return {'number': state.number, 'target': state.target,
+            'counts': state.counts, 'spawns': list(plan.schedule)}
+
+
+def round_from_message(message):
+    """
+    Make the round described by a round reply again
+    :param message: (dict) the reply
+    :return: (RoundState)
+    """
+    plan = RoundPlan([], message['counts'], None)
+    plan.schedule = collections.deque(tuple(spawn)
+                                      for spawn in message['spawns'])
+    return RoundState(message['number'], message['target'],
+                      message['counts'], plan)
+
+
+class GameServer:
+
+    """
+    The sessions of every client and the replies to their requests
+
+    Attributes:
+        sessions (dict): the GameEngine of each session number
+        next_session (int): the number the next session gets
+        requests (int): how many requests have been answered
+    """
+
+    def __init__(self):
+        self.sessions = {}
+        self.next_session = 1
+        self.requests = 0
+
+    def handle(self, request, owned):
+        """
+        Answer one request
+        :param request: (dict) the decoded request
+        :param owned: (set) the sessions of the connection it came on
+        :return: (dict) the reply
+        """
+        self.requests += 1
+        if not isinstance(request, dict):
+            return {'id': None, 'error': 'bad request: not an object'}
+        op = request.get('op')
+        reply = {'id': request.get('id')}
+        if op == 'new':
+            difficulty = request.get('difficulty', 'easy')
+            if difficulty not in DIFFICULTIES:
+                reply['error'] = f'unknown difficulty {difficulty!r}'
+                return reply
+            engine = GameEngine(difficulty, request.get('seed'))
+            session = self.next_session
+            self.next_session += 1
+            self.sessions[session] = engine
+            owned.add(session)
+            reply.update(session=session, seed=engine.seed,
+                         speed=engine.speed)
+        elif op == 'stats':
+            reply.update(sessions=len(self.sessions),
+                         requests=self.requests,
+                         cpu_s=time.process_time())
+            if resource is not None:
+                reply['max_rss_kib'] = resource.getrusage(
+                    resource.RUSAGE_SELF).ru_maxrss
+            return reply
+        else:
+            session = request.get('session')
+            engine = self.sessions.get(session)
+            if engine is None or session not in owned:
+                reply['error'] = f'unknown session {session!r}'
+                return reply
+            if op == 'round':
+                reply.update(round_message(engine.new_round()))
+                # The answer is all the server needs from now on
+                engine.current.plan = None
+            elif op == 'answer':
+                if engine.current is None:
+                    reply['error'] = 'no round to answer'
+                    return reply
+                reply['answer'] = engine.current.answer
+                reply['correct'] = engine.submit(int(request['answer']))
+                # A round is answered once
+                engine.current = None
+            elif op == 'reset':
+                engine.reset()
+            elif op == 'close':
+                del self.sessions[session]
+                owned.discard(session)
+                return reply
+            else:
+                reply['error'] = f'unknown op {op!r}'
+                return reply
+        reply.update(lives=engine.lives, round=engine.round,
+                     score=engine.score, game_over=engine.game_over)
+        return reply
+
+    async def serve(self, reader, writer):
+        """
+        Answer the requests of one connection until it closes
+        :param reader: (asyncio.StreamReader) the requests
+        :param writer: (asyncio.StreamWriter) where the replies go
+        :return:
+        """
+        owned = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    reply = self.handle(json.loads(line), owned)
+                except (ValueError, KeyError, TypeError) as error:
+                    reply = {'id': None, 'error': f'bad request: {error}'}
+                writer.write(json.dumps(reply, separators=(',', ':'))
+                             .encode() + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for session in owned:
+                self.sessions.pop(session, None)
+            writer.close()
+
+
+class RemoteEngine:
+
+    """
+    Plays one session on a GameServer with the methods of GameEngine
+    that CountingGame uses
+
+    Argument:
+    address (String): host:port of the server
+    difficulty (String): one of the keys of DIFFICULTIES
+    seed (int): the session seed, a random one when None
+
+    Attributes:
+        file (file object): the connection to the server
+        session (int): the session number on the server
+        difficulty (String): hold the difficulty mode
+        seed (int): the session seed
+        speed (int): the speed of animation
+        lives (int): hold the player's lives
+        round (int): hold the current round that player is play
+        score (int): hold the score that player has earn
+        current (RoundState): the round being played, None before the
+                              first round
+    """
+
+    def __init__(self, address, difficulty='easy', seed=None):
+        host, port = address.rsplit(':', 1)
+        self.file = socket.create_connection((host, int(port))).makefile(
+            'rwb')
+        self.difficulty = difficulty
+        self.current = None
+        reply = self.call('new', difficulty=difficulty, seed=seed)
+        self.session = reply['session']
+        self.seed = reply['seed']
+        self.speed = reply['speed']
+        self.lives = DIFFICULTIES[difficulty]['lives']
+        self.round = 1
+        self.score = 0
+
+    def call(self, op, **fields):
+        """
+        Send one request and wait for its reply
+        :param op: (String) the request op
+        :param fields: the other fields of the request
+        :return: (dict) the reply
+        """
+        fields.update(op=op, id=op)
+        self.file.write(json.dumps(fields).encode() + b'\n')
+        self.file.flush()
+        line = self.file.readline()
+        if not line:
+            raise ConnectionError('the game server closed the connection')
+        reply = json.loads(line)
+        if 'error' in reply:
+            raise RuntimeError(reply['error'])
+        if 'lives' in reply:
+            self.lives = reply['lives']
+            self.round = reply['round']
+            self.score = reply['score']
+        return reply
+
+    @property
+    def game_over(self):
+        return self.lives <= 0
+
+    def reset(self):
+        self.call('reset', session=self.session)
+        self.current = None
+
+    def new_round(self):
+        reply = self.call('round', session=self.session)
+        self.current = round_from_message(reply)
+        return self.current
+
+    def submit(self, answer):
+        return self.call('answer', session=self.session,
+                         answer=answer)['correct']
+
+    def close(self):
+        self.file.close()
+
+
+class StdoutWriter:
+
+    """
+    Writes the replies to stdout with the methods of StreamWriter that
+    GameServer.serve uses, stdout may be a file so it is written to
+    directly
+    """
+
+    def write(self, data):
+        sys.stdout.buffer.write(data)
+
+    async def drain(self):
+        sys.stdout.buffer.flush()
+
+    def close(self):
+        sys.stdout.buffer.flush()
+
+
+async def serve_stdio(server):
+    """
+    Answer requests from stdin on stdout until stdin closes
+    :param server: (GameServer)
+    :return:
+    """
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    await loop.connect_read_pipe(
+        lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+    await server.serve(reader, StdoutWriter())
+
+
+async def serve_tcp(server, host, port):
+    """
+    Answer requests on a TCP socket until the process is stopped
+    :param server: (GameServer)
+    :param host: (String) the address to listen on
+    :param port: (int) the port to listen on, any free one when 0
+    :return:
+    """
+    listener = await asyncio.start_server(server.serve, host, port)
+    host, port = listener.sockets[0].getsockname()[:2]
+    # The first line tells a script that started the server where it is
+    print(f'listening on {host}:{port}', flush=True)
+    async with listener:
+        await listener.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Serve counting game sessions')
+    parser.add_argument('--host', default='127.0.0.1',
+                        help='Address to listen on')
+    parser.add_argument('--port', type=int, default=8765,
+                        help='Port to listen on, 0 for any free port')
+    parser.add_argument('--stdio', action='store_true',
+                        help='Answer requests on stdin and stdout instead')
+    arguments = parser.parse_args()
+
+    server = GameServer()
+    try:
+        if arguments.stdio:
+            asyncio.run(serve_stdio(server))
+        else:
+            asyncio.run(serve_tcp(server, arguments.host, arguments.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
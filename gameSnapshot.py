@@ -0,0 +1,482 @@
+# ----------------------------------------------------------------------
+# Name:        The counting game live snapshot
+# Author:       Counting Game contributors
+# Purpose:     let other processes watch a running game
+#
+# Date:       Fall 2026
+# ----------------------------------------------------------------------
+"""
+Live state of a running counting game in a memory-mapped file
+
+Every frame the game writes its state to a small file with a fixed
+layout, mapped into memory: the round, lives and score, where every
+image on the canvas is and how long the frames take. Spectator and
+monitoring processes map the same file read-only and read it straight
+from memory, no socket, no Tk and nothing for the game to answer, so
+watching hundreds of games costs the games nothing more than writing
+a few hundred bytes per frame.
+
+The layout, little-endian:
+
+    offset 0    magic b'CGSN', version, capacity of the image columns
+    offset 8    sequence number
+    offset 16   the state: wall clock time of the write, pid, flags,
+                round, lives, score, frames, images on screen, images
+                in the columns, frame ms, slowest frame ms, ms between
+                frames, player name and difficulty
+    offset 108  the columns: x of every image (float), then the index
+                of its image file and its lane (one byte each)
+
+The sequence number makes it safe to read while the game writes (a
+seqlock): the writer makes it odd before a write and even after it, a
+reader reads the number, the state, the number again, and starts over
+when the number was odd or changed. The writer never waits on readers.
+
+Watch games from the command line:
+
+    python gameSnapshot.py kiosk*.snap
+    python gameSnapshot.py kiosk1.snap --lanes
+    python gameSnapshot.py kiosk*.snap --json --once
+"""
+
+import argparse
+import array
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+
+from gameEngine import LANES, WIDTH
+
+MAGIC = b'CGSN'
+VERSION = 1
+# magic, version and capacity
+PREFIX = struct.Struct('<4sHH')
+SEQUENCE = struct.Struct('<Q')
+SEQUENCE_AT = PREFIX.size
+STATE = struct.Struct('<dIIiiiIIIfff32s8s')
+STATE_AT = SEQUENCE_AT + SEQUENCE.size
+# the most images stored by default, more are only counted
+CAPACITY = 1024
+# flags of the state
+GAME_OVER = 1
+CLOSED = 2
+# frames the frame times are averaged over
+WINDOW = 50
+# times a reader tries before it gives up on a writer that is busy
+RETRIES = 1000
+# width of the lanes drawn by the spectator
+COLUMNS = 64
+
+
+def layout(capacity):
+    """
+    Where the columns of a snapshot start and how long it is
+    :param capacity: (int) the most images stored
+    :return: tuple of the offset of the x column, of the image column,
+             of the lane column and the size of the file
+    """
+    xs_at = STATE_AT + STATE.size
+    images_at = xs_at + 4 * capacity
+    lanes_at = images_at + capacity
+    return xs_at, images_at, lanes_at, lanes_at + capacity
+
+
+class SnapshotWriter:
+
+    """
+    Publishes the state of one game to a snapshot file, every frame
+
+    Argument:
+    path (String): the snapshot file, replaced if it exists
+    name (String): the name of the player
+    difficulty (String): the difficulty of the game
+    capacity (int): the most images stored, the rest are only counted
+
+    Attributes:
+        path (String): the snapshot file
+        capacity (int): the most images stored
+        map (mmap.mmap): the mapped file, None once closed
+        sequence (int): the sequence number, even between writes
+        identity (tuple): the player name and difficulty as bytes
+        images (dict): the index of the image file of every handle
+        flags (int): GAME_OVER and CLOSED
+        frames (int): how many frames were published
+        frame_ms (float): the average ms a frame takes
+        slowest (float): the slowest frame ms of the current window
+        window_max (float): the slowest frame ms of the last window
+        interval_ms (float): the average ms between two frames
+        last (float): when the last frame was published, in seconds
+    """
+
+    def __init__(self, path, name, difficulty, capacity=CAPACITY):
+        self.path = path
+        self.capacity = capacity
+        self.sequence = 0
+        self.identity = (name.encode()[:32], difficulty.encode()[:8])
+        self.images = {}
+        self.flags = 0
+        self.frames = 0
+        self.frame_ms = None
+        self.slowest = 0.0
+        self.window_max = 0.0
+        self.interval_ms = None
+        self.last = None
+
+        # Readers only ever see a whole file: it is filled in under
+        # another name and then renamed over the old one
+        size = layout(capacity)[-1]
+        temporary = f'{path}.{os.getpid()}.tmp'
+        with open(temporary, 'wb') as file:
+            file.write(PREFIX.pack(MAGIC, VERSION, capacity))
+            file.write(bytes(size - PREFIX.size))
+        os.replace(temporary, path)
+        with open(path, 'r+b') as file:
+            self.map = mmap.mmap(file.fileno(), size)
+        self.write(0, 0, 0, 0.0, [])
+
+    def add(self, handle, index):
+        """
+        Start following a new image
+        :param handle: the handle of the image from the render backend
+        :param index: (int) the index of its image file
+        :return:
+        """
+        self.images[handle] = index
+
+    def remove(self, handle):
+        """
+        Stop following an image
+        :param handle: the handle of the image
+        :return:
+        """
+        self.images.pop(handle, None)
+
+    def publish(self, now, game_round, lives, score, game_over, cost,
+                positions):
+        """
+        Write the state of one frame
+        :param now: (float) the time of the frame in seconds
+        :param game_round: (int) the current round
+        :param lives: (int) the lives left
+        :param score: (int) the score
+        :param game_over: (boolean) True when the lives ran out
+        :param cost: (float) the ms the frame took
+        :param positions: (list) (handle, lane, x) of every image
+        :return:
+        """
+        if self.map is None:
+            return
+        if self.last is not None:
+            interval = (now - self.last) * 1000
+            if self.interval_ms is None:
+                self.interval_ms = interval
+            else:
+                self.interval_ms += (interval - self.interval_ms) \
+                    * 2 / (WINDOW + 1)
+        self.last = now
+        if self.frame_ms is None:
+            self.frame_ms = cost
+        else:
+            self.frame_ms += (cost - self.frame_ms) * 2 / (WINDOW + 1)
+        self.slowest = max(self.slowest, cost)
+        self.frames += 1
+        if self.frames % WINDOW == 0:
+            self.window_max = self.slowest
+            self.slowest = 0.0
+        if game_over:
+            self.flags |= GAME_OVER
+        else:
+            self.flags &= ~GAME_OVER
+        self.write(game_round, lives, score,
+                   max(self.window_max, self.slowest), positions)
+
+    def write(self, game_round, lives, score, frame_max, positions):
+        """
+        Write the state and the columns between two sequence numbers
+        :param game_round: (int) the current round
+        :param lives: (int) the lives left
+        :param score: (int) the score
+        :param frame_max: (float) the slowest recent frame ms
+        :param positions: (list) (handle, lane, x) of every image
+        :return:
+        """
+        shown = positions[:self.capacity]
+        xs_at, images_at, lanes_at, size = layout(self.capacity)
+        xs = array.array('f', [x for handle, lane, x in shown]).tobytes()
+        images = bytes([self.images.get(handle, 0)
+                        for handle, lane, x in shown])
+        lanes = bytes([lane for handle, lane, x in shown])
+
+        self.sequence += 1
+        SEQUENCE.pack_into(self.map, SEQUENCE_AT, self.sequence)
+        STATE.pack_into(self.map, STATE_AT, time.time(), os.getpid(),
+                        self.flags, game_round, lives, score, self.frames,
+                        len(positions), len(shown), self.frame_ms or 0.0,
+                        frame_max, self.interval_ms or 0.0,
+                        *self.identity)
+        self.map[xs_at:xs_at + len(xs)] = xs
+        self.map[images_at:images_at + len(images)] = images
+        self.map[lanes_at:lanes_at + len(lanes)] = lanes
+        self.sequence += 1
+        SEQUENCE.pack_into(self.map, SEQUENCE_AT, self.sequence)
+
+    def close(self):
+        """
+        Mark the game as closed and unmap the file, the file stays for
+        the monitors to see the final state
+        :return:
+        """
+        if self.map is None:
+            return
+        self.flags |= CLOSED
+        game_round, lives, score = STATE.unpack_from(self.map,
+                                                     STATE_AT)[3:6]
+        self.write(game_round, lives, score, self.window_max, [])
+        self.map.close()
+        self.map = None
+
+
+class SnapshotReader:
+
+    """
+    Reads the snapshots of one game, without ever writing to them
+
+    Argument:
+    path (String): the snapshot file
+
+    Attributes:
+        path (String): the snapshot file
+        map (mmap.mmap): the file mapped read-only
+        capacity (int): the most images stored
+        inode (int): the file mapped, a new game replaces it
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as file:
+            self.inode = os.fstat(file.fileno()).st_ino
+            self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.map) < STATE_AT:
+            self.map.close()
+            raise ValueError(f'{path} is not a game snapshot')
+        magic, version, self.capacity = PREFIX.unpack_from(self.map)
+        if magic != MAGIC or len(self.map) < layout(self.capacity)[-1]:
+            self.map.close()
+            raise ValueError(f'{path} is not a game snapshot')
+        if version != VERSION:
+            self.map.close()
+            raise ValueError(f'unknown snapshot version {version}')
+
+    def read(self, images=True):
+        """
+        Read a consistent state, trying again while the game writes
+        :param images: (boolean) False to leave out where the images are
+        :return: (dict) the state, None when the writer stayed busy
+        """
+        xs_at, images_at, lanes_at, size = layout(self.capacity)
+        for attempt in range(RETRIES):
+            before, = SEQUENCE.unpack_from(self.map, SEQUENCE_AT)
+            if before % 2:
+                time.sleep(0)
+                continue
+            state = STATE.unpack_from(self.map, STATE_AT)
+            # a torn read of the count is caught by the sequence check
+            written = min(state[8], self.capacity)
+            if images:
+                xs = array.array('f')
+                xs.frombytes(self.map[xs_at:xs_at + 4 * written])
+                indexes = self.map[images_at:images_at + written]
+                lanes = self.map[lanes_at:lanes_at + written]
+            after, = SEQUENCE.unpack_from(self.map, SEQUENCE_AT)
+            if after != before:
+                continue
+            (wall_time, pid, flags, game_round, lives, score, frames,
+             sprites, written, frame_ms, frame_max_ms, interval_ms,
+             name, difficulty) = state
+            snapshot = {
+                'sequence': before, 'time': wall_time, 'pid': pid,
+                'name': name.rstrip(b'\0').decode(errors='ignore'),
+                'difficulty': difficulty.rstrip(b'\0').decode(),
+                'round': game_round, 'lives': lives, 'score': score,
+                'game_over': bool(flags & GAME_OVER),
+                'closed': bool(flags & CLOSED), 'frames': frames,
+                'sprites': sprites, 'frame_ms': round(frame_ms, 3),
+                'frame_max_ms': round(frame_max_ms, 3),
+                'fps': round(1000 / interval_ms, 1) if interval_ms else 0}
+            if images:
+                snapshot['images'] = list(zip(indexes, lanes, xs))
+            return snapshot
+        return None
+
+    def close(self):
+        self.map.close()
+
+
+class Spectator:
+
+    """
+    Watches the snapshot files of many games, opening each one again
+    when a new game replaces it
+
+    Argument:
+    paths (list): the snapshot files
+    stale (float): seconds without a frame after which a game is stale
+
+    Attributes:
+        paths (list): the snapshot files
+        stale (float): seconds without a frame after which a game is
+                       stale
+        readers (dict): the reader of every file opened
+    """
+
+    def __init__(self, paths, stale):
+        self.paths = paths
+        self.stale = stale
+        self.readers = {}
+
+    def reader(self, path):
+        """
+        The reader of a file, opened again when the file was replaced
+        :param path: (String) the snapshot file
+        :return: (SnapshotReader) None when there is no snapshot
+        """
+        try:
+            inode = os.stat(path).st_ino
+        except OSError:
+            inode = None
+        reader = self.readers.get(path)
+        if reader is not None and reader.inode == inode:
+            return reader
+        if reader is not None:
+            reader.close()
+            del self.readers[path]
+        if inode is None:
+            return None
+        try:
+            self.readers[path] = SnapshotReader(path)
+        except (OSError, ValueError):
+            return None
+        return self.readers[path]
+
+    def poll(self, images=False):
+        """
+        Read every game once
+        :param images: (boolean) True to read where the images are
+        :return: (list) the snapshot of every file, with its path and
+                 a status: playing, game over, closed, stale, busy or
+                 missing
+        """
+        found = []
+        for path in self.paths:
+            reader = self.reader(path)
+            snapshot = None if reader is None else reader.read(images)
+            if reader is None:
+                snapshot = {'status': 'missing'}
+            elif snapshot is None:
+                snapshot = {'status': 'busy'}
+            elif snapshot['closed']:
+                snapshot['status'] = 'closed'
+            elif time.time() - snapshot['time'] > self.stale:
+                snapshot['status'] = 'stale'
+            elif snapshot['game_over']:
+                snapshot['status'] = 'game over'
+            else:
+                snapshot['status'] = 'playing'
+            snapshot['path'] = path
+            found.append(snapshot)
+        return found
+
+    def close(self):
+        for reader in self.readers.values():
+            reader.close()
+        self.readers.clear()
+
+
+def table(snapshots):
+    """
+    One line per game
+    :param snapshots: (list) the snapshots from Spectator.poll
+    :return: (String)
+    """
+    lines = [f'{"player":<16} {"level":<6} {"round":>5} {"lives":>5} '
+             f'{"score":>5} {"images":>6} {"fps":>5} {"ms":>6} '
+             f'{"max ms":>6}  status']
+    for snapshot in snapshots:
+        if 'round' not in snapshot:
+            lines.append(f'{snapshot["path"]:<47}  {snapshot["status"]}')
+            continue
+        lines.append(f'{snapshot["name"][:16]:<16} '
+                     f'{snapshot["difficulty"]:<6} '
+                     f'{snapshot["round"]:>5} {snapshot["lives"]:>5} '
+                     f'{snapshot["score"]:>5} {snapshot["sprites"]:>6} '
+                     f'{snapshot["fps"]:>5.1f} {snapshot["frame_ms"]:>6.2f} '
+                     f'{snapshot["frame_max_ms"]:>6.2f}  '
+                     f'{snapshot["status"]}')
+    return '\n'.join(lines)
+
+
+def draw_lanes(snapshot):
+    """
+    The lanes of a game as text, every image as the number of its file
+    :param snapshot: (dict) a snapshot read with its images
+    :return: (String)
+    """
+    rows = [['.'] * COLUMNS for lane in LANES]
+    for index, lane, x in snapshot.get('images', []):
+        column = min(COLUMNS - 1, max(0, int(x * COLUMNS / WIDTH)))
+        rows[lane][column] = str(index)
+    return '\n'.join(''.join(row) for row in rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Watch running games through their snapshot files')
+    parser.add_argument('paths', nargs='+', metavar='FILE',
+                        help='Snapshot files written with --snapshot')
+    parser.add_argument('--interval', type=float, default=1.0,
+                        help='Seconds between two reads')
+    parser.add_argument('--once', action='store_true',
+                        help='Read every game once and stop')
+    parser.add_argument('--json', action='store_true',
+                        help='Print one JSON line per game')
+    parser.add_argument('--lanes', action='store_true',
+                        help='Also draw where the images are')
+    parser.add_argument('--stale', type=float, default=5.0,
+                        help='Seconds without a frame before a game is '
+                             'shown as stale')
+    arguments = parser.parse_args()
+    if arguments.interval <= 0 or arguments.stale <= 0:
+        parser.error('interval and stale must be positive numbers')
+
+    spectator = Spectator(arguments.paths, arguments.stale)
+    try:
+        while True:
+            snapshots = spectator.poll(arguments.lanes)
+            if arguments.json:
+                for snapshot in snapshots:
+                    print(json.dumps(snapshot))
+            else:
+                if not arguments.once and sys.stdout.isatty():
+                    # draw over the last read
+                    print('\x1b[H\x1b[2J', end='')
+                print(table(snapshots))
+                if arguments.lanes:
+                    for snapshot in snapshots:
+                        if 'round' in snapshot:
+                            print(f'\n{snapshot["name"]}:')
+                            print(draw_lanes(snapshot))
+            sys.stdout.flush()
+            if arguments.once:
+                break
+            time.sleep(arguments.interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        spectator.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+# ----------------------------------------------------------------------
+# Name:        The counting game statistics
+# Author:       Counting Game contributors
+# Purpose:     measure how long frames take and how busy tkinter is
+#
+# Date:       Fall 2026
+# ----------------------------------------------------------------------
+"""
+Frame time and hot path instrumentation for the counting game
+
+FrameStats wraps the methods it should time and the canvas whose
+calls it should count. Every `window` frames it writes one summary
+row to a JSONL or CSV file: a histogram of frame times, tkinter calls
+per frame, live images, the length of the spawn queue and the time
+spent in each wrapped method. Every row has the same columns: the
+gauges named up front, 0 until they are sampled, and the hot paths
+wrapped before the first frame.
+"""
+
+import csv
+import json
+import time
+
+# upper edge (in ms) of each bucket of the frame time histogram, the
+# last bucket holds everything slower
+HISTOGRAM_EDGES = (1, 2, 4, 8, 16, 33, 50, 100)
+
+
+class CallCounter:
+
+    """
+    Stand in for an object that counts every method called on it
+
+    Argument:
+    target: the object to forward the calls to
+    stats (FrameStats): where the calls are counted
+
+    Attributes:
+        target: the object to forward the calls to
+        stats (FrameStats): where the calls are counted
+    """
+
+    def __init__(self, target, stats):
+        self.target = target
+        self.stats = stats
+
+    def __getattr__(self, name):
+        attribute = getattr(self.target, name)
+        if not callable(attribute):
+            return attribute
+
+        def counted(*args, **kwargs):
+            self.stats.calls += 1
+            return attribute(*args, **kwargs)
+        return counted
+
+    def __str__(self):
+        # tkinter uses str() of a widget as its Tcl name
+        return str(self.target)
+
+
+class FrameStats:
+
+    """
+    Collect frame statistics and write them out every window frames
+
+    Argument:
+    path (String): the file to write to, CSV if it ends in .csv and
+                   JSONL otherwise, None to only keep the numbers
+    window (int): how many frames each summary row covers
+    gauges (tuple): the names of the live values every row has
+
+    Attributes:
+        path (String): the file to write to
+        window (int): how many frames each summary row covers
+        gauge_names (tuple): the names of the live values every row
+                             has, 0 until they are sampled
+        frames (int): how many frames have been measured in total
+        calls (int): the tkinter calls counted in the current frame
+        durations (list): the time of each frame of the window in ms
+        frame_calls (list): the tkinter calls of each frame of the
+                            window
+        histogram (list): how many frames of the window fall in each
+                          bucket of HISTOGRAM_EDGES
+        hot_paths (dict): the number of calls and total ms of each
+                          timed method in the window
+        gauges (dict): the latest sample of live values such as the
+                       number of images on screen
+        last_summary (dict): the last summary row written
+    """
+
+    def __init__(self, path=None, window=50, gauges=()):
+        self.path = path
+        self.window = window
+        self.gauge_names = gauges
+        self.frames = 0
+        self.calls = 0
+        self.durations = []
+        self.frame_calls = []
+        self.histogram = [0] * (len(HISTOGRAM_EDGES) + 1)
+        self.hot_paths = {}
+        self.gauges = {}
+        self.last_summary = None
+        self.file = None
+        self.writer = None
+        if path is not None:
+            self.file = open(path, 'a', newline='')
+
+    def count_calls(self, target):
+        """
+        Count every method called on target from now on
+        :param target: the object to watch, usually a canvas
+        :return: (CallCounter) use it in place of target
+        """
+        return CallCounter(target, self)
+
+    def timed(self, name, function):
+        """
+        Time every call of a hot path function
+        :param name: (String) the name to report the function under
+        :param function: the function to time
+        :return: a function that calls function and records its time
+        """
+        # listed from the start so every summary row has the same
+        # columns
+        self.hot_paths.setdefault(name, (0, 0.0))
+
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.record(name, (time.perf_counter() - start) * 1000)
+        return wrapper
+
+    def frame(self, function, sample):
+        """
+        Measure every call of function as one frame
+        :param function: the function that draws one frame
+        :param sample: function returning a dict of live values to
+                       record after each frame
+        :return: a function that calls function and records the frame
+        """
+        self.hot_paths.setdefault('frame', (0, 0.0))
+
+        def wrapper():
+            self.calls = 0
+            start = time.perf_counter()
+            function()
+            duration = (time.perf_counter() - start) * 1000
+            self.record('frame', duration)
+            self.end_frame(duration, sample())
+        return wrapper
+
+    def record(self, name, duration):
+        """
+        Add one call of a hot path to the window
+        :param name: (String) the name of the hot path
+        :param duration: (float) how long the call took in ms
+        :return:
+        """
+        count, total = self.hot_paths.get(name, (0, 0.0))
+        self.hot_paths[name] = (count + 1, total + duration)
+
+    def end_frame(self, duration, gauges):
+        """
+        Add one frame to the window and write the window out when it
+        is full
+        :param duration: (float) how long the frame took in ms
+        :param gauges: (dict) live values sampled after the frame
+        :return:
+        """
+        self.frames += 1
+        self.durations.append(duration)
+        self.frame_calls.append(self.calls)
+        bucket = 0
+        while bucket < len(HISTOGRAM_EDGES) and \
+                duration > HISTOGRAM_EDGES[bucket]:
+            bucket += 1
+        self.histogram[bucket] += 1
+        self.gauges = gauges
+        if len(self.durations) >= self.window:
+            self.flush()
+
+    def summary(self):
+        """
+        Summarize the frames of the current window
+        :return: (dict) one row of statistics, None if the window is
+                 empty
+        """
+        if not self.durations:
+            return None
+        durations = sorted(self.durations)
+        row = {
+            'time': time.time(),
+            'frames': self.frames,
+            'frame_ms_mean': sum(durations) / len(durations),
+            'frame_ms_p50': durations[len(durations) // 2],
+            'frame_ms_p95': durations[int(len(durations) * 0.95)],
+            'frame_ms_max': durations[-1],
+            'tk_calls_mean': sum(self.frame_calls) / len(self.frame_calls),
+            'tk_calls_max': max(self.frame_calls),
+        }
+        for edge, count in zip(HISTOGRAM_EDGES, self.histogram):
+            row[f'hist_le_{edge}ms'] = count
+        row[f'hist_gt_{HISTOGRAM_EDGES[-1]}ms'] = self.histogram[-1]
+        row.update(dict.fromkeys(self.gauge_names, 0))
+        row.update(self.gauges)
+        for name, (count, total) in sorted(self.hot_paths.items()):
+            row[f'{name}_calls'] = count
+            row[f'{name}_ms'] = total
+        return row
+
+    def flush(self):
+        """
+        Write the summary of the current window and start a new one
+        :return:
+        """
+        row = self.summary()
+        if row is None:
+            return
+        self.last_summary = row
+        if self.file is not None:
+            if self.path.endswith('.csv'):
+                if self.writer is None:
+                    # A value that was not named up front makes
+                    # writerow fail instead of going missing
+                    self.writer = csv.DictWriter(self.file, list(row))
+                    if self.file.tell() == 0:
+                        self.writer.writeheader()
+                self.writer.writerow(row)
+            else:
+                self.file.write(json.dumps(row) + '\n')
+            self.file.flush()
+        self.durations.clear()
+        self.frame_calls.clear()
+        self.histogram = [0] * (len(HISTOGRAM_EDGES) + 1)
+        for name in self.hot_paths:
+            self.hot_paths[name] = (0, 0.0)
+
+    def overlay_text(self):
+        """
+        Short text of the last window for an on screen overlay
+        :return: (String)
+        """
+        row = self.last_summary
+        if row is None:
+            return ''
+        return (f"frame {row['frame_ms_mean']:.1f} ms "
+                f"(p95 {row['frame_ms_p95']:.1f})  "
+                f"tk calls {row['tk_calls_mean']:.0f}  "
+                f"sprites {row.get('sprites', 0)}")
+
+    def close(self):
+        """
+        Write out what is left of the window and close the file
+        :return:
+        """
+        self.flush()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
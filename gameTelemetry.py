@@ -0,0 +1,137 @@
+# ----------------------------------------------------------------------
+# Name:        The counting game telemetry
+# Author:       Counting Game contributors
+# Purpose:     stream what happens in every round to a file
+#
+# Date:       Fall 2026
+# ----------------------------------------------------------------------
+"""
+Per-round telemetry of the counting game
+
+The game emits an event when a round starts, when its first image
+appears, when its last image leaves the canvas and when the player
+answers. Each event becomes one JSON line:
+
+    {"event": "answer", "time": 1556000000.1, "player": "Ann",
+     "difficulty": "easy", "seed": 42, "round": 3, "ms": 8120, ...}
+
+time is the wall clock, ms the time since the round started.
+
+Emitting only puts the event on a queue, a writer thread turns the
+events into lines and writes them in batches, so the Tk main loop
+never waits on the file. When the file grows past max_bytes it is
+renamed to FILE.1 (FILE.1 to FILE.2 and so on, keeping backups of
+them) and a new one is started. close writes everything still queued.
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+
+
+class TelemetryWriter:
+
+    """
+    Writes events to a JSONL file from a thread, rotating it by size
+
+    Argument:
+    path (String): the telemetry file, appended to
+    fields (dict): fields added to every event
+    max_bytes (int): the size after which the file is rotated
+    backups (int): how many rotated files are kept
+
+    Attributes:
+        path (String): the telemetry file
+        fields (dict): fields added to every event
+        max_bytes (int): the size after which the file is rotated
+        backups (int): how many rotated files are kept
+        queue (queue.Queue): the events waiting for the writer, None
+                             once the writer is closed
+        writer (threading.Thread): writes the events
+        events (int): how many events have been written
+    """
+
+    def __init__(self, path, fields=None, max_bytes=10 * 1024 * 1024,
+                 backups=5):
+        self.path = path
+        self.fields = fields or {}
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.queue = queue.Queue()
+        self.events = 0
+        self.writer = threading.Thread(target=self.write,
+                                       args=(self.queue,), daemon=True,
+                                       name='telemetry-writer')
+        self.writer.start()
+
+    def emit(self, event, **fields):
+        """
+        Queue one event, returns right away
+        :param event: (String) the kind of event
+        :param fields: the fields of the event
+        :return:
+        """
+        if self.queue is not None:
+            self.queue.put((event, time.time(), fields))
+
+    def rotate(self, file):
+        """
+        Close the full file, shift the older ones and start a new one
+        :param file: (file object) the full file
+        :return: (file object) the new file
+        """
+        file.close()
+        for number in range(self.backups - 1, 0, -1):
+            older = f'{self.path}.{number}'
+            if os.path.exists(older):
+                os.replace(older, f'{self.path}.{number + 1}')
+        if self.backups > 0:
+            os.replace(self.path, f'{self.path}.1')
+        else:
+            os.remove(self.path)
+        return open(self.path, 'a')
+
+    def write(self, events):
+        """
+        Write the queued events until the writer is closed, runs in
+        the writer thread
+        :param events: (queue.Queue) the queue of the events
+        :return:
+        """
+        file = open(self.path, 'a')
+        closing = False
+        while not closing:
+            batch = [events.get()]
+            while True:
+                try:
+                    batch.append(events.get_nowait())
+                except queue.Empty:
+                    break
+            lines = []
+            for item in batch:
+                if item is None:
+                    closing = True
+                    continue
+                event, when, fields = item
+                record = {'event': event, 'time': when}
+                record.update(self.fields)
+                record.update(fields)
+                lines.append(json.dumps(record) + '\n')
+            file.write(''.join(lines))
+            file.flush()
+            self.events += len(lines)
+            if file.tell() >= self.max_bytes:
+                file = self.rotate(file)
+        file.close()
+
+    def close(self):
+        """
+        Write every event still queued and close the file
+        :return:
+        """
+        if self.queue is not None:
+            self.queue.put(None)
+            self.queue = None
+            self.writer.join()
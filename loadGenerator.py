@@ -0,0 +1,248 @@
+# ----------------------------------------------------------------------
+# Name:        The counting game load generator
+# Author:       Counting Game contributors
+# Purpose:     measure how many sessions one game server can hold
+#
+# Date:       Fall 2026
+# ----------------------------------------------------------------------
+"""
+Load generator for gameServer
+
+Opens many sessions over a few connections, all at once, then plays
+rounds in every session as fast as the server answers: ask for a
+round, answer it (right most of the time) and reset the sessions that
+run out of lives. Reports the latency of every request, the server CPU
+time they cost and the server memory per session, and from those how
+many sessions one core could serve at a human pace:
+
+    python loadGenerator.py --sessions 5000 --rounds 10
+
+A server is started for the run unless --address points at one.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+
+def get_arguments():
+    """
+    Parse and validate the command line arguments.
+    :return: (argparse.Namespace) the load settings
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--address', metavar='HOST:PORT',
+                        help='A running server, one is started if not given')
+    parser.add_argument('--sessions', type=int, default=1000,
+                        help='Sessions to hold open at once')
+    parser.add_argument('--connections', type=int, default=10,
+                        help='Connections the sessions are spread over')
+    parser.add_argument('--rounds', type=int, default=5,
+                        help='Rounds to play in each session')
+    parser.add_argument('--difficulty', default='medium',
+                        choices=['easy', 'medium', 'hard'])
+    parser.add_argument('--accuracy', type=float, default=0.8,
+                        help='How often the simulated players are right')
+    parser.add_argument('--round-seconds', type=float, default=10,
+                        help='How long a human takes over one round, used '
+                             'to turn CPU time into sessions per core')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Seed of the sessions and the answers')
+    arguments = parser.parse_args()
+    if arguments.sessions <= 0 or arguments.connections <= 0 or \
+            arguments.rounds <= 0:
+        parser.error('sessions, connections and rounds must be positive')
+    return arguments
+
+
+def percentile(values, fraction):
+    """
+    The value below which the given fraction of values fall
+    :param values: (list) sorted numbers
+    :param fraction: (float) from 0 to 1
+    :return: (float)
+    """
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+class Connection:
+
+    """
+    One connection to the server that many sessions send requests on
+    at the same time, each reply is matched to its request by id
+
+    Argument:
+    reader (asyncio.StreamReader): the replies
+    writer (asyncio.StreamWriter): where the requests go
+
+    Attributes:
+        reader (asyncio.StreamReader): the replies
+        writer (asyncio.StreamWriter): where the requests go
+        waiting (dict): the future of each request id not answered yet
+        ids (iterator): gives each request its id
+        latencies (list): ms from sending to the reply of every request
+        listener (asyncio.Task): reads the replies
+    """
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.waiting = {}
+        self.ids = itertools.count()
+        self.latencies = []
+        self.listener = asyncio.ensure_future(self.listen())
+
+    async def listen(self):
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                break
+            reply = json.loads(line)
+            future = self.waiting.pop(reply['id'], None)
+            if future is not None:
+                future.set_result(reply)
+
+    async def call(self, op, **fields):
+        """
+        Send one request and wait for its reply
+        :param op: (String) the request op
+        :param fields: the other fields of the request
+        :return: (dict) the reply
+        """
+        request_id = next(self.ids)
+        future = asyncio.get_running_loop().create_future()
+        self.waiting[request_id] = future
+        fields.update(op=op, id=request_id)
+        start = time.perf_counter()
+        self.writer.write(json.dumps(fields).encode() + b'\n')
+        reply = await future
+        self.latencies.append((time.perf_counter() - start) * 1000)
+        if 'error' in reply:
+            raise RuntimeError(reply['error'])
+        return reply
+
+    async def close(self):
+        self.writer.close()
+        await self.listener
+
+
+async def play(connection, session, rounds, accuracy, rng):
+    """
+    Play rounds in one session as fast as the server answers
+    :param connection: (Connection) the connection of the session
+    :param session: (int) the session number
+    :param rounds: (int) how many rounds to play
+    :param accuracy: (float) how often the answer is right
+    :param rng: (random.Random) picks the wrong answers
+    :return:
+    """
+    for number in range(rounds):
+        reply = await connection.call('round', session=session)
+        answer = reply['counts'][reply['target']]
+        if rng.random() >= accuracy:
+            answer += rng.choice((-1, 1))
+        reply = await connection.call('answer', session=session,
+                                      answer=answer)
+        if reply['game_over']:
+            await connection.call('reset', session=session)
+
+
+async def run(settings, host, port):
+    """
+    Open every session then play them all
+    :param settings: (argparse.Namespace) the load settings
+    :param host: (String) the server address
+    :param port: (int) the server port
+    :return: (dict) the results
+    """
+    connections = [Connection(*await asyncio.open_connection(host, port))
+                   for number in range(settings.connections)]
+    control = connections[0]
+    before = await control.call('stats')
+
+    # Hold every session open at the same time
+    start = time.perf_counter()
+    opened = await asyncio.gather(*(
+        connections[number % len(connections)].call(
+            'new', difficulty=settings.difficulty,
+            seed=settings.seed + number)
+        for number in range(settings.sessions)))
+    open_seconds = time.perf_counter() - start
+    held = await control.call('stats')
+    for connection in connections:
+        connection.latencies.clear()
+
+    rng = random.Random(settings.seed)
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        play(connections[number % len(connections)], reply['session'],
+             settings.rounds, settings.accuracy,
+             random.Random(rng.random()))
+        for number, reply in enumerate(opened)))
+    play_seconds = time.perf_counter() - start
+    latencies = sorted(latency for connection in connections
+                       for latency in connection.latencies)
+    after = await control.call('stats')
+    for connection in connections:
+        await connection.close()
+
+    requests = len(latencies)
+    cpu_s = after['cpu_s'] - held['cpu_s']
+    # A played round is one round request and one answer
+    cpu_per_round = cpu_s / (settings.sessions * settings.rounds)
+    results = {
+        'sessions': settings.sessions,
+        'connections': settings.connections,
+        'rounds': settings.rounds,
+        'open_seconds': open_seconds,
+        'play_seconds': play_seconds,
+        'requests': requests,
+        'requests_per_second': requests / play_seconds,
+        'server_cpu_s': cpu_s,
+        'server_cpu_ms_per_round': cpu_per_round * 1000,
+        'sessions_per_core': settings.round_seconds / cpu_per_round,
+        'latency_ms_p50': percentile(latencies, 0.50),
+        'latency_ms_p95': percentile(latencies, 0.95),
+        'latency_ms_p99': percentile(latencies, 0.99),
+        'latency_ms_max': latencies[-1],
+    }
+    if 'max_rss_kib' in held:
+        results['server_kib_per_session'] = \
+            (held['max_rss_kib'] - before['max_rss_kib']) / settings.sessions
+    return results
+
+
+def main():
+    settings = get_arguments()
+    server = None
+    if settings.address is None:
+        # Start a server on any free port, it prints where it listens
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                              'gameServer.py')
+        server = subprocess.Popen([sys.executable, script, '--port', '0'],
+                                  stdout=subprocess.PIPE, text=True)
+        address = server.stdout.readline().split()[-1]
+    else:
+        address = settings.address
+    host, port = address.rsplit(':', 1)
+
+    try:
+        results = asyncio.run(run(settings, host, int(port)))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    for key, value in results.items():
+        print(f'{key:>26}: {value:.3f}' if isinstance(value, float)
+              else f'{key:>26}: {value}')
+
+
+if __name__ == "__main__":
+    main()
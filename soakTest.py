@@ -0,0 +1,332 @@
+# ----------------------------------------------------------------------
+# Name:        The counting game soak test
+# Author:       Counting Game contributors
+# Purpose:     play the game for hours and catch anything that leaks
+#
+# Date:       Fall 2026
+# ----------------------------------------------------------------------
+"""
+Soak test of the counting game
+
+Plays CountingGame by itself the way a kiosk sees it: the welcome
+screen sits idle for a while, then over and over: start, answer rounds
+(right or wrong, before or after the images are gone), reset in the
+middle of a round, give up and play again. It fails as soon as a
+callback of the frame loop raises or stops being called. After every
+cycle, always at the end screen, it samples
+
+    memory      the Python memory in use, from tracemalloc, without
+                the samples themselves
+    items       the items on every canvas (find_all)
+    callbacks   the after callbacks waiting to run
+    widgets     every widget under the root window
+
+and fails if any of them keeps growing: the samples after the warm up
+are split in quarters and a count fails when the largest value of each
+quarter is larger than in the quarter before, memory when the mean of
+each quarter is and it grew by more than the tolerance. Caches and
+pools that fill up once do not fail.
+
+By default the game runs on the in-memory tkinter of fakeTkinter, with
+a fake clock so hours of play take minutes. With --real-tk it runs on
+the real tkinter in real time, which needs a display (it falls back to
+fakeTkinter when there is none):
+
+    python soakTest.py --cycles 500
+    xvfb-run python soakTest.py --real-tk --hours 8
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import random
+import sys
+import time
+import tracemalloc
+
+import countingGame
+import fakeTkinter
+from gameHarness import HeadlessGame
+
+# Memory, canvas items, after callbacks and widgets
+RESOURCES = ('memory_kib', 'items', 'callbacks', 'widgets')
+# The samples kept here grow on purpose, they are not counted
+OWN_MEMORY = (tracemalloc.Filter(False, __file__),
+              tracemalloc.Filter(False, tracemalloc.__file__))
+
+
+def get_arguments():
+    """
+    Parse and validate the command line arguments.
+    :return: (argparse.Namespace) the soak settings
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument('difficulty', choices=['easy', 'medium', 'hard'],
+                        nargs='?', default='medium')
+    parser.add_argument('--cycles', type=int, default=200,
+                        help='Play again this many times')
+    parser.add_argument('--hours', type=float,
+                        help='Keep playing this long instead of --cycles')
+    parser.add_argument('--warmup', type=int, default=20,
+                        help='Cycles played before sampling starts')
+    parser.add_argument('--tolerance', type=float, default=256,
+                        help='KiB memory may grow by before it fails')
+    parser.add_argument('--backend', choices=['canvas', 'buffer'],
+                        default='canvas')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Seed of the game and of the simulated player')
+    parser.add_argument('--report', type=int, default=20,
+                        help='Print the samples every this many cycles')
+    parser.add_argument('--real-tk', action='store_true',
+                        help='Play on the real tkinter (needs a display)')
+    arguments = parser.parse_args()
+    if arguments.cycles <= 0 or arguments.warmup < 0:
+        parser.error('cycles must be positive and warmup not negative')
+    return arguments
+
+
+class Player:
+
+    """
+    Plays a game by itself, on the fake clock of fakeTkinter or on the
+    real tkinter in real time
+
+    Argument:
+    tk: the tkinter module the game draws with
+    settings (argparse.Namespace): the soak settings
+
+    Attributes:
+        tk: the tkinter module the game draws with
+        harness (HeadlessGame): runs the game, on a fake clock on
+                                fakeTkinter
+        root (tkinter.Tk): the root window
+        game (CountingGame): the game being played
+        frame_callbacks (list): the callbacks of the frame loop once
+                                the game started
+        rng (random.Random): decides what the player does
+        rounds (int): how many rounds were answered
+    """
+
+    def __init__(self, tk, settings):
+        self.tk = tk
+        self.rng = random.Random(settings.seed)
+        self.rounds = 0
+        argv = [settings.difficulty, 'Soak', f'--seed={settings.seed}',
+                f'--backend={settings.backend}']
+        self.harness = HeadlessGame(argv, tk, fake_clock=False)
+        self.root = self.harness.root
+        self.game = self.harness.game
+        # Sit on the welcome screen for a while, like a kiosk does
+        self.harness.start(self.rng.uniform(1, 10))
+        self.frame_callbacks = list(self.game.driver.callbacks)
+
+    def wait(self, seconds):
+        """
+        Let the game run, frames and every other after callback
+        :param seconds: (float) for how long
+        :return:
+        """
+        self.harness.wait(seconds)
+
+    def broken(self):
+        """
+        What went wrong with the frame loop: errors raised by its
+        callbacks and callbacks it no longer calls
+        :return: (list) a description of each problem
+        """
+        problems = [f'a frame failed: {error!r}'
+                    for error in self.harness.errors]
+        for callback in self.frame_callbacks:
+            if callback not in self.game.driver.callbacks:
+                problems.append(f'{callback.__name__} left the frame loop')
+        return problems
+
+    def play_round(self):
+        """
+        Play one round: start it, watch it and answer, or reset in the
+        middle of it
+        :return: (boolean) False once the game is over
+        """
+        game = self.game
+        game.game_logic()
+        # Usually watch until every image left, sometimes answer early
+        if self.rng.random() < 0.8:
+            for second in range(120):
+                self.wait(1)
+                if game.plan is None or (not game.plan.remaining
+                                         and not game.sprites):
+                    break
+        else:
+            self.wait(self.rng.uniform(0.5, 5))
+        if self.rng.random() < 0.05:
+            game.reset_func()
+            return True
+        answer = game.answer
+        if self.rng.random() < 0.3:
+            answer += self.rng.choice((-1, 1))
+        game.user_input.set(str(answer))
+        game.get_user_answer()
+        self.rounds += 1
+        self.wait(0.5)
+        return not game.engine.game_over
+
+    def play_cycle(self):
+        """
+        Play from a new game to the end screen, giving up at a random
+        round when the lives do not run out before
+        :return:
+        """
+        if self.game.canvas1 is not None:
+            # Play Again on the end screen
+            self.game.reset_func()
+        for number in range(self.rng.randint(1, 8)):
+            if not self.play_round():
+                break
+        if not self.game.engine.game_over:
+            self.game.end_game()
+        self.wait(1)
+
+    def widgets(self):
+        """
+        Every widget under the root window
+        :return: (list)
+        """
+        found = []
+        waiting = self.root.winfo_children()
+        while waiting:
+            widget = waiting.pop()
+            found.append(widget)
+            waiting.extend(widget.winfo_children())
+        return found
+
+    def sample(self):
+        """
+        Measure everything that could leak
+        :return: (dict) the value of each resource
+        """
+        gc.collect()
+        widgets = self.widgets()
+        if hasattr(self.root, 'after_info'):
+            callbacks = len(self.root.after_info())
+        else:
+            # tkinter before Python 3.13 has no after_info
+            callbacks = len(self.root.tk.splitlist(
+                self.root.tk.call('after', 'info')))
+        snapshot = tracemalloc.take_snapshot().filter_traces(OWN_MEMORY)
+        return {
+            'memory_kib': sum(statistic.size for statistic
+                              in snapshot.statistics('filename')) / 1024,
+            'items': sum(len(widget.find_all()) for widget in widgets
+                         if isinstance(widget, self.tk.Canvas)),
+            'callbacks': callbacks,
+            'widgets': len(widgets),
+        }
+
+    def close(self):
+        self.harness.close()
+
+
+def growing(samples, tolerance):
+    """
+    The resources that grew from every quarter of the samples to the
+    next
+    :param samples: (list) the samples after the warm up
+    :param tolerance: (float) KiB memory may grow by
+    :return: (list) the names of the resources that keep growing
+    """
+    size = len(samples) // 4
+    quarters = [samples[number * size:(number + 1) * size]
+                for number in range(4)]
+    found = []
+    for name in RESOURCES:
+        if name == 'memory_kib':
+            levels = [sum(sample[name] for sample in quarter) / size
+                      for quarter in quarters]
+            grew = levels[-1] - levels[0] > tolerance
+        else:
+            levels = [max(sample[name] for sample in quarter)
+                      for quarter in quarters]
+            grew = True
+        if grew and all(before < after for before, after
+                        in zip(levels, levels[1:])):
+            found.append(name)
+    return found
+
+
+def pick_tkinter(real_tk):
+    """
+    The tkinter module to play on
+    :param real_tk: (boolean) True to try the real tkinter
+    :return: the module
+    """
+    if real_tk:
+        try:
+            countingGame.tkinter.Tk().destroy()
+            return countingGame.tkinter
+        except countingGame.tkinter.TclError as error:
+            print(f'no display ({error}), playing on fakeTkinter')
+    return fakeTkinter
+
+
+def main():
+    settings = get_arguments()
+    tk = pick_tkinter(settings.real_tk)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    samples = []
+    first = None
+    player = Player(tk, settings)
+    cycle = 0
+    while True:
+        cycle += 1
+        with contextlib.redirect_stdout(io.StringIO()):
+            player.play_cycle()
+        problems = player.broken()
+        if problems:
+            break
+        if cycle == settings.warmup + 1:
+            # Compared with the last one when something leaks
+            first = tracemalloc.take_snapshot()
+        if cycle > settings.warmup:
+            samples.append(player.sample())
+        if samples and cycle % settings.report == 0:
+            values = '  '.join(f'{name} {samples[-1][name]:.0f}'
+                               for name in RESOURCES)
+            print(f'cycle {cycle:>6}  rounds {player.rounds:>7}  '
+                  f'{values}')
+        if settings.hours is not None:
+            if time.perf_counter() - start >= settings.hours * 3600:
+                break
+        elif cycle >= settings.cycles + settings.warmup:
+            break
+    last = tracemalloc.take_snapshot()
+    player.close()
+    tracemalloc.stop()
+
+    elapsed = time.perf_counter() - start
+    print(f'{cycle} cycles, {player.rounds} rounds in {elapsed:.0f} s')
+    if problems:
+        print(f'the frame loop broke in cycle {cycle}:')
+        for problem in problems:
+            print(f'  {problem}')
+        sys.exit(1)
+    if len(samples) < 8:
+        print('not enough cycles after the warm up to tell')
+        sys.exit(2)
+    leaks = growing(samples, settings.tolerance)
+    for name in RESOURCES:
+        print(f'{name:>10}: {samples[0][name]:.0f} -> '
+              f'{samples[-1][name]:.0f}'
+              + ('  GROWING' if name in leaks else ''))
+    if leaks:
+        print('\nlargest memory growth since the warm up:')
+        for difference in last.compare_to(first, 'lineno')[:10]:
+            print(f'  {difference}')
+        sys.exit(1)
+    print('nothing grows')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+# ----------------------------------------------------------------------
+# Name:        The counting game tests
+# Author:       Counting Game contributors
+# Purpose:     check the frame loop and the game screens without a
+#              display
+#
+# Date:       Fall 2026
+# ----------------------------------------------------------------------
+"""
+Unit tests of countingGame, run with python -m pytest or unittest
+"""
+
+import contextlib
+import io
+import unittest
+
+from countingGame import TickDriver, numpy
+from gameHarness import HeadlessGame
+
+
+class Root:
+
+    """
+    Just enough of a root window for a TickDriver
+
+    Attributes:
+        pending (list): (ms, function) of every after call
+        errors (list): every exception reported by a callback
+    """
+
+    def __init__(self):
+        self.pending = []
+        self.errors = []
+
+    def after(self, ms, function):
+        self.pending.append((ms, function))
+        return f'after#{len(self.pending)}'
+
+    def after_cancel(self, after_id):
+        pass
+
+    def report_callback_exception(self, exc, value, trace):
+        self.errors.append(value)
+
+
+class TickDriverTest(unittest.TestCase):
+
+    def test_tick_calls_every_callback_and_schedules_the_next(self):
+        root = Root()
+        driver = TickDriver(root, fps=50)
+        calls = []
+        driver.add(lambda: calls.append('a'))
+        driver.add(lambda: calls.append('b'))
+        driver.tick()
+        self.assertEqual(calls, ['a', 'b'])
+        self.assertEqual([function for ms, function in root.pending],
+                         [driver.tick])
+
+    def test_failing_callback_is_reported_and_kept(self):
+        root = Root()
+        driver = TickDriver(root, fps=50)
+        calls = []
+
+        def broken():
+            calls.append('broken')
+            raise ValueError('bad frame')
+
+        driver.add(broken)
+        driver.add(lambda: calls.append('next'))
+        driver.tick()
+        driver.tick()
+        self.assertEqual(calls, ['broken', 'next'] * 2)
+        self.assertEqual([str(error) for error in root.errors],
+                         ['bad frame'] * 2)
+        self.assertIn(broken, driver.callbacks)
+        self.assertEqual(len(root.pending), 2)
+
+
+class WelcomeScreenTest(unittest.TestCase):
+
+    def play(self, backend):
+        """
+        Sit on the welcome screen, then start and play a round
+        :param backend: (String) the render backend
+        :return:
+        """
+        harness = HeadlessGame(['easy', '--seed=3', f'--backend={backend}'])
+        game = harness.game
+        harness.wait(2)
+        self.assertEqual(harness.errors, [])
+        # The frame loop ran all along
+        self.assertEqual(game.last_frame, harness.clock())
+        harness.start(0)
+        with contextlib.redirect_stdout(io.StringIO()):
+            game.game_logic()
+        harness.wait(3)
+        self.assertEqual(harness.errors, [])
+        self.assertGreater(len(game.sprites), 0)
+        harness.close()
+
+    def test_canvas_frames_before_start(self):
+        self.play('canvas')
+
+    @unittest.skipIf(numpy is None, 'the buffer backend needs NumPy')
+    def test_buffer_frames_before_start(self):
+        self.play('buffer')
+
+
+if __name__ == "__main__":
+    unittest.main()
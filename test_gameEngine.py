@@ -0,0 +1,91 @@
+# ----------------------------------------------------------------------
+# Name:        The counting game engine tests
+# Author:       Counting Game contributors
+# Purpose:     check the rules of the game without a window
+#
+# Date:       Fall 2026
+# ----------------------------------------------------------------------
+"""
+Unit tests of gameEngine, run with python -m pytest or unittest
+"""
+
+import unittest
+
+from gameEngine import GameEngine, DIFFICULTIES, STEP_MS, check_plan, \
+    lane_spacing
+
+
+def play(seed, rounds=10, difficulty='medium', prefetch=False):
+    """
+    Play rounds of a game, answering every one right
+    :param seed: (int) the session seed
+    :param rounds: (int) how many rounds to play
+    :param difficulty: (String) the difficulty mode
+    :param prefetch: (boolean) True to make the rounds in a worker
+    :return: (list) the target, counts and plan of every round
+    """
+    engine = GameEngine(difficulty, seed, prefetch=prefetch)
+    played = []
+    for number in range(rounds):
+        state = engine.new_round()
+        played.append((state.target, state.counts, list(state.plan)))
+        engine.submit(state.answer)
+    engine.close()
+    return played
+
+
+class DeterminismTest(unittest.TestCase):
+
+    def test_same_seed_same_rounds(self):
+        self.assertEqual(play(42), play(42))
+
+    def test_prefetch_makes_the_same_rounds(self):
+        self.assertEqual(play(42), play(42, prefetch=True))
+
+    def test_seeds_make_different_rounds(self):
+        self.assertNotEqual(play(1), play(2))
+
+
+class RulesTest(unittest.TestCase):
+
+    def test_answers_score_or_cost_a_life(self):
+        engine = GameEngine('medium', 5)
+        state = engine.new_round()
+        self.assertTrue(engine.submit(state.answer))
+        state = engine.new_round()
+        self.assertFalse(engine.submit(state.answer + 1))
+        self.assertEqual((engine.round, engine.score, engine.lives),
+                         (3, 1, 1))
+        self.assertFalse(engine.game_over)
+        engine.new_round()
+        engine.submit(-1)
+        self.assertTrue(engine.game_over)
+
+
+class LanePlanTest(unittest.TestCase):
+
+    def test_plans_never_overlap(self):
+        for difficulty in DIFFICULTIES:
+            engine = GameEngine(difficulty, seed=7)
+            # Late rounds have many copies waiting for a free lane
+            engine.round = 200
+            for number in range(20):
+                state = engine.new_round()
+                self.assertEqual(check_plan(state.plan, engine.speed,
+                                            state.counts),
+                                 sum(state.counts))
+                engine.submit(state.answer)
+
+    def test_check_plan_finds_overlap(self):
+        spacing = lane_spacing(2)
+        check_plan([(STEP_MS, 0, 0), (STEP_MS + spacing, 1, 0)], 2)
+        with self.assertRaises(ValueError):
+            check_plan([(STEP_MS, 0, 0), (spacing, 1, 0)], 2)
+
+    def test_check_plan_finds_lost_copies(self):
+        with self.assertRaises(ValueError):
+            check_plan([(0, 0, 0)], 2, counts=[2, 0, 0, 0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+# ----------------------------------------------------------------------
+# Name:        The counting game replay tests
+# Author:       Counting Game contributors
+# Purpose:     check that recorded sessions read and play back the same
+#
+# Date:       Fall 2026
+# ----------------------------------------------------------------------
+"""
+Unit tests of gameReplay, run with python -m pytest or unittest
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from gameHarness import HeadlessGame
+from gameReplay import ReplayRecorder, read_sessions, play_back, HEADER
+
+
+class ReplayTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'session.replay')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_events_read_back_the_same(self):
+        now = [0.0]
+        recorder = ReplayRecorder(self.path, 'hard', 2 ** 64 - 1, 60,
+                                  lambda: now[0])
+        recorder.round_start(1)
+        now[0] = 0.5
+        recorder.spawn(480.0, 3, 2)
+        now[0] = 2.25
+        recorder.answer(-2 ** 31, 0, 0)
+        recorder.end(0)
+        recorder.close()
+        self.assertEqual(read_sessions(self.path), [
+            ('hard', 2 ** 64 - 1, 60, [(b'R', 0, (1,)),
+                                       (b'S', 500, (480, 3, 2)),
+                                       (b'A', 2250, (-2 ** 31, 0, 0)),
+                                       (b'G', 2250, (0,))])])
+
+    def test_other_version_is_refused(self):
+        with open(self.path, 'wb') as replay:
+            replay.write(HEADER.pack(b'CGRP', 99, 0, 1, 50))
+        with self.assertRaises(ValueError):
+            read_sessions(self.path)
+
+    def test_played_session_plays_back_the_same(self):
+        harness = HeadlessGame(['medium', 'Replay', '--seed=11',
+                                f'--record={self.path}'])
+        harness.start(0.4)
+        game = harness.game
+        with contextlib.redirect_stdout(io.StringIO()):
+            for number in range(4):
+                game.game_logic()
+                harness.wait(2 + number * 1.5)
+                # One wrong answer, the lives do not run out
+                game.user_input.set(str(game.answer + (number == 1)))
+                game.get_user_answer()
+                harness.wait(0.3)
+            game.end_game()
+        harness.close()
+        self.assertEqual(harness.errors, [])
+        sessions = read_sessions(self.path)
+        self.assertEqual(len(sessions), 1)
+        self.assertEqual(play_back(*sessions[0]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+# ----------------------------------------------------------------------
+# Name:        The counting game scores tests
+# Author:       Counting Game contributors
+# Purpose:     check the high score store
+#
+# Date:       Fall 2026
+# ----------------------------------------------------------------------
+"""
+Unit tests of gameScores, run with python -m pytest or unittest
+"""
+
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from gameScores import ScoreStore
+
+
+class ScoreStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'scores.db')
+        self.store = ScoreStore(self.path)
+
+    def tearDown(self):
+        self.store.close()
+        self.directory.cleanup()
+
+    def test_scores_show_right_away_and_are_kept(self):
+        self.store.add('Ann', 'easy', 5, 6)
+        self.store.add('Bob', 'easy', 7, 8)
+        self.store.add('Cy', 'hard', 9, 9)
+        self.assertEqual(self.store.top('easy'), [('Bob', 7), ('Ann', 5)])
+        self.assertEqual(self.store.best('Ann', 'easy'), 5)
+        self.store.close()
+        self.store = ScoreStore(self.path)
+        self.assertEqual(self.store.top('easy'), [('Bob', 7), ('Ann', 5)])
+        self.assertEqual(self.store.best('Cy', 'hard'), 9)
+        self.assertIsNone(self.store.best('Cy', 'easy'))
+
+    def test_committed_game_still_pending_counts_once(self):
+        # The writer committed the game and has not taken it out of
+        # pending yet
+        game = ('Ann', 'easy', 5, 6, 1.5)
+        connection = sqlite3.connect(self.path)
+        with connection:
+            connection.execute('INSERT INTO games (player, difficulty, '
+                               'score, rounds, played) '
+                               'VALUES (?, ?, ?, ?, ?)', game)
+        connection.close()
+        with self.store.lock:
+            self.store.pending.append(game)
+        self.assertEqual(self.store.top('easy'), [('Ann', 5)])
+        self.assertEqual(self.store.best('Ann', 'easy'), 5)
+
+    def test_same_score_twice_is_two_games(self):
+        self.store.add('Ann', 'easy', 5, 6)
+        self.store.add('Ann', 'easy', 5, 7)
+        self.assertEqual(self.store.top('easy'), [('Ann', 5), ('Ann', 5)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+# ----------------------------------------------------------------------
+# Name:        The counting game snapshot tests
+# Author:       Counting Game contributors
+# Purpose:     check that readers only ever see whole snapshots
+#
+# Date:       Fall 2026
+# ----------------------------------------------------------------------
+"""
+Unit tests of gameSnapshot, run with python -m pytest or unittest
+"""
+
+import os
+import tempfile
+import threading
+import unittest
+
+from gameSnapshot import SnapshotWriter, SnapshotReader, SEQUENCE, \
+    SEQUENCE_AT
+
+
+class SnapshotTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'game.snapshot')
+        self.writer = SnapshotWriter(self.path, 'Ann', 'hard', capacity=4)
+        self.reader = SnapshotReader(self.path)
+
+    def tearDown(self):
+        self.reader.close()
+        self.writer.close()
+        self.directory.cleanup()
+
+    def test_published_frame_reads_back(self):
+        self.writer.add('a', 2)
+        self.writer.add('b', 3)
+        self.writer.publish(1.0, 4, 1, 3, False, 2.5,
+                            [('a', 0, 25.0), ('b', 3, 100.5)])
+        snapshot = self.reader.read()
+        self.assertEqual(snapshot['sequence'] % 2, 0)
+        self.assertEqual((snapshot['name'], snapshot['difficulty']),
+                         ('Ann', 'hard'))
+        self.assertEqual((snapshot['round'], snapshot['lives'],
+                          snapshot['score'], snapshot['sprites']),
+                         (4, 1, 3, 2))
+        self.assertEqual(snapshot['images'], [(2, 0, 25.0), (3, 3, 100.5)])
+        self.assertFalse(snapshot['game_over'] or snapshot['closed'])
+
+    def test_images_past_capacity_are_only_counted(self):
+        positions = [(handle, handle % 4, float(handle))
+                     for handle in range(10)]
+        self.writer.publish(1.0, 1, 3, 0, False, 1.0, positions)
+        snapshot = self.reader.read()
+        self.assertEqual(snapshot['sprites'], 10)
+        self.assertEqual(len(snapshot['images']), 4)
+
+    def test_busy_writer_is_not_read(self):
+        # An odd sequence number means a write is half done
+        sequence, = SEQUENCE.unpack_from(self.writer.map, SEQUENCE_AT)
+        SEQUENCE.pack_into(self.writer.map, SEQUENCE_AT, sequence + 1)
+        self.assertIsNone(self.reader.read())
+        SEQUENCE.pack_into(self.writer.map, SEQUENCE_AT, sequence + 2)
+        self.assertIsNotNone(self.reader.read())
+
+    def test_reads_are_never_torn(self):
+        # Every frame the score, the count and every x are the same
+        # number, a read mixing two frames would show two of them
+        def publish():
+            for frame in range(20000):
+                self.writer.publish(frame / 50, 1, 1, frame, False, 1.0,
+                                    [(0, 0, float(frame))] * (frame % 5))
+
+        thread = threading.Thread(target=publish)
+        thread.start()
+        reads = 0
+        while thread.is_alive():
+            snapshot = self.reader.read()
+            if snapshot is None:
+                continue
+            reads += 1
+            score = snapshot['score']
+            self.assertEqual(snapshot['sprites'], score % 5)
+            self.assertEqual(snapshot['images'],
+                             [(0, 0, float(score))] * (score % 5))
+        thread.join()
+        self.assertGreater(reads, 0)
+
+    def test_closed_game_keeps_its_state(self):
+        self.writer.publish(1.0, 7, 0, 6, True, 1.0, [])
+        self.writer.close()
+        snapshot = self.reader.read()
+        self.assertTrue(snapshot['closed'] and snapshot['game_over'])
+        self.assertEqual((snapshot['round'], snapshot['score']), (7, 6))
+
+
+if __name__ == "__main__":
+    unittest.main()